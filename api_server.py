@@ -1,13 +1,24 @@
-from fastapi import FastAPI, BackgroundTasks, HTTPException
+from fastapi import FastAPI, BackgroundTasks, HTTPException, Request, Response, Query
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
-from sports_monitor_bot import SportsMonitorBot
+from sports_monitor_bot import SportsMonitorBot, serialize_matches
+from request_scheduler import get_scheduler
+from feed_bus import FeedPublisher, FeedSubscriber
+from snapshot import Snapshot, Payload, EMPTY_SNAPSHOT
+from shared_snapshot import SharedSnapshotReader
+from change_stream import ChangeBroadcaster
+from change_history import ChangeHistory
+from match_index import FIELDS, QUERY_PARAMS, project
+from metrics import PIPELINE, SERVER, REQUEST_LATENCY, RESPONSES, SNAPSHOT_AGE, SNAPSHOT_VERSION
 import os
+import json
+import time
 from dotenv import load_dotenv
 import asyncio
-from typing import Dict, List
+from typing import List, Optional
 from datetime import datetime
-import digitalocean
+from do_client import DOClient, DOError
 
 # Load environment variables if .env exists
 try:
@@ -26,46 +37,159 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class MetricsMiddleware:
+    """Per-endpoint latency (until response headers) and status counts, as plain ASGI"""
+
+    def __init__(self, app):
+        self.app = app
+        self.paths = None
+
+    def endpoint_path(self, scope) -> str:
+        if self.paths is None:
+            self.paths = {route.endpoint: route.path for route in app.routes if hasattr(route, 'endpoint')}
+        return self.paths.get(scope.get('endpoint'), 'unmatched')
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+        started = time.perf_counter()
+
+        async def timed_send(message):
+            if message['type'] == 'http.response.start':
+                path = self.endpoint_path(scope)
+                REQUEST_LATENCY.observe(time.perf_counter() - started, path, scope['method'])
+                RESPONSES.inc(path, message['status'])
+            await send(message)
+
+        await self.app(scope, receive, timed_send)
+
+app.add_middleware(MetricsMiddleware)
+
+# "producer" polls the sports API and publishes to the local feed bus,
+# "subscriber" serves whatever the feed producer (sports_monitor_bot.py) publishes,
+# "shared" does the same but maps the producer's shared snapshot file instead of
+# re-encoding each cycle, so it can run with any number of workers
+FEED_ROLE = os.getenv('SPORTS_FEED_ROLE', 'producer')
+
 # Global bot instance
 bot = SportsMonitorBot()
+feed = FeedPublisher()
+broadcaster = ChangeBroadcaster()
+history = ChangeHistory()
+shared_reader = SharedSnapshotReader() if FEED_ROLE == 'shared' else None
+# Whether this process polls the API; a producer that finds another one
+# already serving the feed bus follows it instead
+producing = False
 
-# Store for latest matches
-latest_matches: Dict[int, List[dict]] = {}
-last_update: datetime = None
+# Latest matches, pre-encoded and indexed for serving. Only ever replaced
+# as a whole, so handlers read it once and use that reference throughout
+current_snapshot: Snapshot = EMPTY_SNAPSHOT
 
-# Initialize Digital Ocean manager
-do_token = os.getenv('DO_API_TOKEN')
-if not do_token:
+# Digital Ocean client for the build log endpoints
+do_client = DOClient()
+if not do_client.configured:
     print("Warning: DO_API_TOKEN not found in environment variables")
-do_manager = digitalocean.Manager(token=do_token) if do_token else None
 
 async def update_matches():
     """Background task to update matches"""
-    global latest_matches, last_update
+    global current_snapshot
     while True:
+        wait = 60
         try:
-            matches = await bot.fetch_live_matches()
-            # Group matches by sport_id
-            matches_by_sport = {}
-            for match in matches:
-                sport_id = match.get('sport_id')
-                if sport_id not in matches_by_sport:
-                    matches_by_sport[sport_id] = []
-                matches_by_sport[sport_id].append(match)
-            latest_matches = matches_by_sport
-            last_update = datetime.now()
+            matches, wait = await bot.poll_due_sports()
+            # Only build a new snapshot when something actually changed
+            if bot.last_changes or current_snapshot.last_update is None:
+                changes = bot.last_changes.to_dict()
+                # Numbered like the feed bus cycle published below, which survives restarts
+                version = history.record(changes, feed.version + 1)
+                # Encoding, compression and indexing stay off the event loop
+                current_snapshot = await asyncio.to_thread(
+                    Snapshot, serialize_matches(matches), datetime.now(), version, parsed=matches
+                )
+                broadcaster.publish(changes, version)
+            await bot.publish(feed, matches)
         except Exception as e:
             print(f"Error updating matches: {str(e)}")
-        await asyncio.sleep(60)  # Update every minute
+        await asyncio.sleep(wait)  # Sleep until the next sport is due
+
+async def follow_feed():
+    """Background task to mirror the snapshots published on the local feed bus"""
+    global current_snapshot
+    # Shared workers read the slate from the mapped file, so they only need notifications
+    async for message in FeedSubscriber(notify=shared_reader is not None).messages():
+        try:
+            changes = message.get('changes') or {}
+            # Our own version; None for a cycle already applied, e.g. re-sent on reconnect
+            version = history.record_upstream(changes, message.get('producer'), message.get('version') or 0)
+            if version is None:
+                continue
+            if shared_reader is not None:
+                # The producer maps each cycle before announcing it; parsing and indexing stay off the event loop
+                snapshot = await asyncio.to_thread(shared_reader.load_indexed)
+                if snapshot is None:
+                    print(f"Error applying feed message: no shared snapshot at {shared_reader.path}")
+                    continue
+            else:
+                meta = {key: message.get(key) for key in ('cadence', 'quota_remaining', 'metrics')}
+                snapshot = await asyncio.to_thread(
+                    Snapshot, message['matches'], datetime.fromisoformat(message['timestamp']), version, meta
+                )
+            current_snapshot = snapshot
+            if history.base == version:
+                # Cycles were missed (or the producer restarted), so deltas would be incomplete
+                broadcaster.resync(version)
+            else:
+                broadcaster.publish(changes, version)
+        except Exception as e:
+            print(f"Error applying feed message: {str(e)}")
 
 @app.on_event("startup")
 async def startup_event():
     """Start the background task on server startup"""
-    asyncio.create_task(update_matches())
+    global current_snapshot, producing
+    if FEED_ROLE in ('subscriber', 'shared'):
+        if shared_reader is not None:
+            current_snapshot = await asyncio.to_thread(shared_reader.load_indexed) or EMPTY_SNAPSHOT
+        asyncio.create_task(follow_feed())
+    elif await feed.start():
+        producing = True
+        bot.open_store()
+        asyncio.create_task(update_matches())
+    else:
+        # Another producer already polls the API; a second poller would share its quota
+        asyncio.create_task(follow_feed())
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop publishing and release pooled upstream connections"""
+    await feed.close()
+    await bot.fetcher.close()
+    # Joins the store's writer thread, so keep it off the event loop
+    await asyncio.to_thread(bot.close_store)
+
+class MappedResponse(Response):
+    """Response that also takes a memoryview body (shared snapshot slices) without copying it"""
+
+    def render(self, content):
+        if isinstance(content, memoryview):
+            return content
+        return super().render(content)
+
+def serve_payload(request: Request, payload: Payload, snapshot: Snapshot) -> Response:
+    """Serve pre-encoded (and precompressed) bytes, or 304 if the client already has them"""
+    encoding, body, etag = payload.select(request.headers.get("accept-encoding"))
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if snapshot.last_modified:
+        headers["Last-Modified"] = snapshot.last_modified
+    if Payload.matches_etag(etag, request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return MappedResponse(content=body, media_type="application/json", headers=headers)
 
 @app.get("/")
 async def root():
-    return {"status": "running", "last_update": last_update}
+    return {"status": "running", "last_update": current_snapshot.last_update}
 
 @app.get("/health")
 async def health_check():
@@ -73,96 +197,160 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.now().isoformat()}
 
 @app.get("/matches")
-async def get_matches():
-    """Get all live matches"""
+async def get_matches(request: Request, sport: Optional[List[int]] = Query(None),
+                      league: Optional[List[str]] = Query(None), team: Optional[str] = None,
+                      min_minute: Optional[int] = Query(None, ge=0), live: Optional[bool] = None,
+                      fields: Optional[str] = None, cursor: Optional[str] = None,
+                      limit: int = Query(100, ge=1, le=1000)):
+    """Get all live matches, or a filtered, projected page of them
+
+    Without filter or paging parameters the pre-encoded snapshot is served
+    as is, whatever else is in the query string (e.g. a cache buster).
+    Otherwise matches come back as one list in (sport_id, id) order, with
+    next_cursor set while more pages remain.
+    """
+    snapshot = current_snapshot
+    if QUERY_PARAMS.isdisjoint(request.query_params.keys()):
+        return serve_payload(request, snapshot.payload, snapshot)
+
+    projection = [field.strip() for field in fields.split(',') if field.strip()] if fields else None
+    unknown = [field for field in projection or [] if field not in FIELDS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    try:
+        page, next_cursor = snapshot.index.query(sport, league, team, min_minute, live, cursor, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     return {
-        "matches": latest_matches,
-        "last_update": last_update
+        "matches": [project(match, projection) for match in page],
+        "next_cursor": next_cursor,
+        "version": snapshot.version,
+        "last_update": snapshot.last_update
     }
 
+@app.get("/matches/stream")
+async def stream_matches(request: Request, sport: Optional[List[int]] = Query(None),
+                         league: Optional[List[str]] = Query(None)):
+    """Push per-match changes as Server-Sent Events, optionally filtered by sport id and league id/name"""
+    client = broadcaster.subscribe(sport, league)
+    last_event_id = request.headers.get("last-event-id", "")
+    if last_event_id.isdigit():
+        # Resuming client: replay what it missed before any new changes
+        broadcaster.replay(client, history.since(int(last_event_id)), history.version)
+    return StreamingResponse(
+        broadcaster.stream(client),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/matches/changes")
+async def get_match_changes(since: int = Query(..., ge=0)):
+    """Get the merged changes since a snapshot version, or a resync marker if it is too old"""
+    version = history.version
+    changes = history.since(since)
+    if changes is None:
+        return {"version": version, "since": since, "resync": True}
+    return {"version": version, "since": since, "resync": False, "changes": changes}
+
+@app.get("/matches/event/{event_id}")
+async def get_match(event_id: str):
+    """Get one live match by its event id"""
+    match = current_snapshot.index.get(event_id)
+    if match is None:
+        raise HTTPException(status_code=404, detail="Match not live")
+    return match.raw
+
 @app.get("/matches/{sport_id}")
-async def get_matches_by_sport(sport_id: int):
+async def get_matches_by_sport(sport_id: int, request: Request):
     """Get live matches for a specific sport"""
+    snapshot = current_snapshot
+    return serve_payload(request, snapshot.sport_payload(sport_id), snapshot)
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics: the fetch pipeline (from the producer) plus this worker's serving metrics"""
+    snapshot = current_snapshot
+    if snapshot.last_update:
+        SNAPSHOT_AGE.set(round((datetime.now() - snapshot.last_update).total_seconds(), 3))
+    SNAPSHOT_VERSION.set(snapshot.version)
+    pipeline = PIPELINE.render() if producing else snapshot.meta.get('metrics') or ''
+    return Response(content=pipeline + SERVER.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/cadence")
+async def get_cadence():
+    """Get the adaptive polling interval chosen for each sport"""
+    if not producing:
+        meta = current_snapshot.meta
+        return {
+            "sports": meta.get('cadence') or {},
+            "quota_remaining": meta.get('quota_remaining')
+        }
     return {
-        "matches": latest_matches.get(sport_id, []),
-        "last_update": last_update
+        "sports": bot.cadence.describe(),
+        "quota_remaining": get_scheduler().remaining()
     }
 
+def deployment_info(deployment: dict) -> dict:
+    return {
+        "deployment_id": deployment.get('id'),
+        "status": deployment.get('phase'),
+        "created_at": deployment.get('created_at')
+    }
+
+def format_log_text(log: dict) -> str:
+    return f"[{log['timestamp']}] {log['message']}\n" if log['timestamp'] else f"{log['message']}\n"
+
+async def deployment_logs(deployment: dict, format: str = "json"):
+    """Build logs as one JSON document, or streamed as NDJSON / plain text while they download
+
+    NDJSON starts with the deployment info line; an error after streaming
+    has started is reported as a final {"error": ...} line.
+    """
+    if format == "json":
+        return {**deployment_info(deployment), "logs": await do_client.build_logs(deployment)}
+
+    async def lines():
+        if format == "ndjson":
+            yield (json.dumps(deployment_info(deployment)) + "\n").encode("utf-8")
+        try:
+            async for logs in do_client.stream_build_logs(deployment):
+                if format == "ndjson":
+                    yield "".join(json.dumps(log) + "\n" for log in logs).encode("utf-8")
+                else:
+                    yield "".join(format_log_text(log) for log in logs).encode("utf-8")
+        except Exception as e:
+            error = json.dumps({"error": str(e)}) if format == "ndjson" else f"Error streaming logs: {str(e)}"
+            yield (error + "\n").encode("utf-8")
+
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/plain"
+    return StreamingResponse(lines(), media_type=media_type, headers={"X-Accel-Buffering": "no"})
+
 @app.get("/logs/build")
-async def get_build_logs():
+async def get_build_logs(format: str = Query("json", pattern="^(json|ndjson|text)$")):
     """Get the latest build logs from Digital Ocean"""
-    do_token = os.getenv('DO_API_TOKEN')
-    if not do_token:
+    if not do_client.configured:
         raise HTTPException(status_code=500, detail="Digital Ocean API token not configured")
     
     try:
-        manager = digitalocean.Manager(token=do_token)
-        # Get the app
-        apps = manager.get_all_apps()
-        app = next((app for app in apps if app.spec['name'] == 'plankton-app'), None)
-        if not app:
-            raise HTTPException(status_code=404, detail="App not found")
-        
-        # Get latest deployment
-        deployments = app.get_deployments()
+        deployments = await do_client.deployments()
         if not deployments:
             return {"message": "No deployments found"}
-        
-        latest_deployment = deployments[0]
-        build_logs = latest_deployment.get_logs('BUILD')
-        
-        # Format logs
-        formatted_logs = []
-        for log in build_logs:
-            formatted_logs.append({
-                "timestamp": datetime.fromtimestamp(log.get('timestamp', 0)).isoformat(),
-                "message": log.get('message', ''),
-                "type": log.get('type', '')
-            })
-        
-        return {
-            "deployment_id": latest_deployment.id,
-            "status": latest_deployment.phase,
-            "created_at": latest_deployment.created_at,
-            "logs": formatted_logs
-        }
+        return await deployment_logs(deployments[0], format)
+    except DOError as e:
+        raise HTTPException(status_code=e.status, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/logs/build/{deployment_id}")
-async def get_deployment_logs(deployment_id: str):
+async def get_deployment_logs(deployment_id: str, format: str = Query("json", pattern="^(json|ndjson|text)$")):
     """Get build logs for a specific deployment"""
-    do_token = os.getenv('DO_API_TOKEN')
-    if not do_token:
+    if not do_client.configured:
         raise HTTPException(status_code=500, detail="Digital Ocean API token not configured")
     
     try:
-        manager = digitalocean.Manager(token=do_token)
-        # Get the app
-        apps = manager.get_all_apps()
-        app = next((app for app in apps if app.spec['name'] == 'plankton-app'), None)
-        if not app:
-            raise HTTPException(status_code=404, detail="App not found")
-        
-        # Get specific deployment
-        deployment = app.get_deployment(deployment_id)
-        build_logs = deployment.get_logs('BUILD')
-        
-        # Format logs
-        formatted_logs = []
-        for log in build_logs:
-            formatted_logs.append({
-                "timestamp": datetime.fromtimestamp(log.get('timestamp', 0)).isoformat(),
-                "message": log.get('message', ''),
-                "type": log.get('type', '')
-            })
-        
-        return {
-            "deployment_id": deployment.id,
-            "status": deployment.phase,
-            "created_at": deployment.created_at,
-            "logs": formatted_logs
-        }
+        return await deployment_logs(await do_client.deployment(deployment_id), format)
+    except DOError as e:
+        raise HTTPException(status_code=e.status, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -1,4 +1,5 @@
 import os
+import asyncio
 from autogpt.agents import Agent
 from autogpt.config import Config
 from autogpt.memory import Memory
@@ -7,12 +8,30 @@ from autogpt.workspace import Workspace
 from dotenv import load_dotenv
 from typing import Dict, List, Any
 import json
+from request_scheduler import get_scheduler
+from match_diff import SnapshotDiffer
+from live_matches import LiveMatchClient
+from match_model import Match
+from match_store import MatchHistory
 
 # Load environment variables
 load_dotenv()
 
+SPORT_IDS = {
+    'soccer': 1,
+    'tennis': 13,
+    'basketball': 18,
+    'volleyball': 91,
+    'hockey': 17
+}
+
 class SportsAgent(Agent):
     def __init__(self):
+        # Recorded match history written by the feed producer, opened read-only
+        self.match_store = MatchHistory()
+        # Live matches from the feed bus, or low-priority API calls without a producer
+        self.live_matches = LiveMatchClient()
+        
         # Initialize AutoGPT configuration
         config = Config()
         config.continuous_mode = True
@@ -80,50 +99,31 @@ class SportsAgent(Agent):
         )
 
     async def get_live_matches(self, sport: str) -> List[Dict[str, Any]]:
-        """Get live matches for a specific sport"""
-        api_key = os.getenv('SPORTS_API_KEY')
-        api_host = os.getenv('SPORTS_API_HOST')
-        
-        sport_ids = {
-            'soccer': 1,
-            'tennis': 13,
-            'basketball': 18,
-            'volleyball': 91,
-            'hockey': 17
-        }
-        
-        if sport.lower() not in sport_ids:
+        """Get live matches for a specific sport, from the local feed bus when a producer is running"""
+        sport_id = SPORT_IDS.get(sport.lower())
+        if sport_id is None:
             return {"error": f"Sport {sport} not supported"}
-            
-        url = f"https://{api_host}/v3/events/inplay"
-        params = {
-            'token': api_key,
-            'sport_id': sport_ids[sport.lower()]
-        }
         
-        try:
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                matches = response.json().get('results', [])
-                # Store matches in agent's memory for future reference
-                self.memory.add(f"live_{sport}_matches", matches)
-                return matches
-            return {"error": f"API request failed with status {response.status_code}"}
-        except Exception as e:
-            return {"error": str(e)}
+        matches = await self.live_matches.raw_matches(sport_id)
+        if matches is None:
+            return {"error": f"Could not fetch live {sport} matches"}
+        # Store matches in agent's memory for future reference
+        self.memory.add(f"live_{sport}_matches", matches)
+        return matches
 
     async def analyze_match(self, match_data: str) -> Dict[str, Any]:
         """Analyze a match and provide insights"""
         try:
-            match = json.loads(match_data)
+            raw = json.loads(match_data)
+            match = Match.from_api(raw, int(raw.get('sport_id') or 0))
             
             # Create analysis prompt
             analysis_prompt = f"""
             Analyze this match:
-            {match.get('home', {}).get('name')} vs {match.get('away', {}).get('name')}
-            Score: {match.get('ss', 'No score')}
-            League: {match.get('league', {}).get('name')}
-            Statistics: {match.get('stats', {})}
+            {match.home} vs {match.away}
+            Score: {match.score or 'No score'}
+            League: {match.league}
+            Statistics: {raw.get('stats', {})}
             
             Provide:
             1. Current match state
@@ -136,12 +136,12 @@ class SportsAgent(Agent):
             thoughts = await self.think(analysis_prompt)
             
             # Store analysis in memory
-            self.memory.add(f"match_analysis_{match.get('id')}", thoughts)
+            self.memory.add(f"match_analysis_{match.id}", thoughts)
             
             return {
-                'match_id': match.get('id'),
+                'match_id': match.id,
                 'analysis': thoughts,
-                'timestamp': match.get('time')
+                'timestamp': raw.get('time')
             }
         except Exception as e:
             return {"error": str(e)}
@@ -168,18 +168,23 @@ class SportsAgent(Agent):
             return {"error": str(e)}
 
     async def get_historical_data(self, team1: str, team2: str) -> Dict[str, Any]:
-        """Get historical data for teams/players"""
-        # This would typically connect to a historical database
-        # For now, return placeholder data
+        """Get historical data for teams/players from the recorded match history"""
+        store = self.match_store
+        head_to_head, team1_form, team2_form = await asyncio.gather(
+            asyncio.to_thread(store.head_to_head, team1, team2),
+            asyncio.to_thread(store.query, team=team1),
+            asyncio.to_thread(store.query, team=team2)
+        )
         return {
-            "head_to_head": "Historical data not implemented yet",
-            "team1_form": "Historical data not implemented yet",
-            "team2_form": "Historical data not implemented yet"
+            "head_to_head": head_to_head,
+            "team1_form": team1_form,
+            "team2_form": team2_form
         }
 
 async def main():
     # Create the sports agent
     agent = SportsAgent()
+    differ = SnapshotDiffer()
     
     # Start the continuous monitoring loop
     while True:
@@ -191,15 +196,16 @@ async def main():
             
             if isinstance(matches, list):
                 print(f"\nAnalyzing {sport} matches...")
-                for match in matches[:3]:  # Analyze top 3 matches per sport
-                    analysis = await agent.analyze_match(json.dumps(match))
-                    print(f"\nMatch Analysis for {match.get('home', {}).get('name')} vs {match.get('away', {}).get('name')}:")
+                sport_id = SPORT_IDS[sport]
+                changes = differ.diff({sport_id: [Match.from_api(raw, sport_id) for raw in matches]})
+                for match in changes.changed_matches()[:3]:  # Analyze up to 3 new or re-scored matches per sport
+                    analysis = await agent.analyze_match(json.dumps(match.to_dict()))
+                    print(f"\nMatch Analysis for {match.home} vs {match.away}:")
                     print(analysis.get('analysis', 'No analysis available'))
         
         # Wait before next update
-        await asyncio.sleep(300)  # 5 minutes delay
+        await asyncio.sleep(get_scheduler().recommended_interval(300))  # 5 minutes delay
 
 if __name__ == "__main__":
-    import asyncio
     print("Starting Sports AutoGPT Agent...")
     asyncio.run(main())
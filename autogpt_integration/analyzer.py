@@ -3,6 +3,7 @@ import json
 from datetime import datetime
 import requests
 from .config import AutoGPTConfig
+from metrics import PIPELINE, SERVER
 
 class SportsAnalyzer:
     def __init__(self, config: AutoGPTConfig):
@@ -23,8 +24,7 @@ class SportsAnalyzer:
 
     async def track_api_performance(self):
         """Track and analyze API endpoint performance"""
-        # Implement API performance tracking
-        pass
+        self.api_stats = {**PIPELINE.to_dict(), **SERVER.to_dict()}
 
     async def analyze_patterns(self, historical_data: List[Dict[str, Any]]):
         """Analyze patterns in sports data for insights"""
@@ -1,12 +1,15 @@
 import os
 import asyncio
 import json
-import requests
 from datetime import datetime
 from typing import Dict, List, Any
 from openai import OpenAI
 from dotenv import load_dotenv
 from loguru import logger
+from request_scheduler import get_scheduler
+from match_diff import SnapshotDiffer
+from live_matches import LiveMatchClient
+from match_model import Match
 
 # Load environment variables
 load_dotenv()
@@ -17,6 +20,8 @@ class AutonomousSportsAgent:
         self.sports_api_key = os.getenv('SPORTS_API_KEY')
         self.sports_api_host = os.getenv('SPORTS_API_HOST')
         self.memory = {}  # Simple memory storage
+        self.differ = SnapshotDiffer()  # Tracks which matches changed since the last cycle
+        self.live_matches = LiveMatchClient()  # Feed bus, or low-priority API calls without a producer
         self.goals = [
             "Monitor live sports events",
             "Analyze match statistics",
@@ -76,41 +81,30 @@ class AutonomousSportsAgent:
                 "next_actions": ["Retry analysis"]
             }
 
-    async def get_live_matches(self, sport: str) -> List[Dict[str, Any]]:
-        """Get live matches for a specific sport"""
-        try:
-            url = f"https://{self.sports_api_host}/v3/events/inplay"
-            params = {
-                'token': self.sports_api_key,
-                'sport_id': self.sports.get(sport.lower())
-            }
-            
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                matches = response.json().get('results', [])
-                self.memory[f"live_{sport}_matches"] = matches
-                return matches
-            return []
-        except Exception as e:
-            logger.error(f"Error fetching {sport} matches: {str(e)}")
+    async def get_live_matches(self, sport: str) -> List[Match]:
+        """Get live matches for a specific sport, from the local feed bus when a producer is running"""
+        sport_id = self.sports.get(sport.lower())
+        if sport_id is None:
+            logger.error(f"❌ Sport {sport} not supported")
             return []
+        matches = await self.live_matches.matches(sport_id) or []
+        self.memory[f"live_{sport}_matches"] = matches
+        return matches
 
-    async def analyze_match(self, match: Dict[str, Any], sport: str) -> Dict[str, Any]:
+    async def analyze_match(self, match: Match, sport: str) -> Dict[str, Any]:
         """Analyze a specific match"""
         match_context = f"""
         Sport: {sport}
-        Match: {match.get('home', {}).get('name')} vs {match.get('away', {}).get('name')}
-        Score: {match.get('ss', 'No score')}
-        League: {match.get('league', {}).get('name')}
-        Statistics: {json.dumps(match.get('stats', {}))}
+        Match: {match.home} vs {match.away}
+        Score: {match.score or 'No score'}
+        League: {match.league}
+        Statistics: {json.dumps(match.raw.get('stats', {}))}
         """
 
         analysis = await self.think(match_context)
         
         # Store analysis in memory
-        match_id = match.get('id')
-        if match_id:
-            self.memory[f"analysis_{match_id}"] = analysis
+        self.memory[f"analysis_{match.id}"] = analysis
 
         return analysis
 
@@ -131,9 +125,10 @@ class AutonomousSportsAgent:
 
                 print(f"Found {len(matches)} live {sport} matches")
                 
-                # Analyze top 3 matches for each sport
-                for match in matches[:3]:
-                    print(f"\nAnalyzing: {match.get('home', {}).get('name')} vs {match.get('away', {}).get('name')}")
+                # Analyze up to 3 new or re-scored matches for each sport
+                changes = self.differ.diff({self.sports[sport]: matches})
+                for match in changes.changed_matches()[:3]:
+                    print(f"\nAnalyzing: {match.home} vs {match.away}")
                     analysis = await self.analyze_match(match, sport)
                     
                     print("\nAnalysis:")
@@ -150,7 +145,7 @@ class AutonomousSportsAgent:
 
             # Wait before next update
             print("\nWaiting 5 minutes before next update...")
-            await asyncio.sleep(300)
+            await asyncio.sleep(get_scheduler().recommended_interval(300))
 
 async def main():
     agent = AutonomousSportsAgent()
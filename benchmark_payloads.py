@@ -0,0 +1,76 @@
+"""Benchmark /matches payload size and per-request CPU with and without precompression
+
+Usage: python benchmark_payloads.py [matches] [requests]
+"""
+
+import sys
+import time
+import gzip
+import random
+from datetime import datetime
+from snapshot import Snapshot, encode_json, brotli
+from sports_config import SUPPORTED_SPORTS
+
+def synthetic_slate(total_matches):
+    """In-play results shaped like the b365 payload, spread across all sports"""
+    rng = random.Random(42)
+    sport_ids = [sport['id'] for sport in SUPPORTED_SPORTS.values()]
+    matches = {sport_id: [] for sport_id in sport_ids}
+    for i in range(total_matches):
+        sport_id = sport_ids[i % len(sport_ids)]
+        league_id = rng.randint(1000, 1100)
+        matches[sport_id].append({
+            'id': str(9000000 + i),
+            'sport_id': str(sport_id),
+            'time': str(1738150000 + i),
+            'time_status': '1',
+            'league': {'id': str(league_id), 'name': f'League {league_id}', 'cc': 'gb'},
+            'home': {'id': str(rng.randint(1, 99999)), 'name': f'Home Team {i}', 'image_id': '0', 'cc': 'gb'},
+            'away': {'id': str(rng.randint(1, 99999)), 'name': f'Away Team {i}', 'image_id': '0', 'cc': 'gb'},
+            'ss': f'{rng.randint(0, 4)}-{rng.randint(0, 4)}',
+            'scores': {'2': {'home': str(rng.randint(0, 4)), 'away': str(rng.randint(0, 4))}},
+            'timer': {'tm': rng.randint(1, 90), 'ts': rng.randint(0, 59), 'tt': '1', 'ta': 0, 'md': 0},
+            'bet365_id': str(100000000 + i)
+        })
+    return matches
+
+def cpu_per_request(handler, requests):
+    start = time.process_time()
+    for _ in range(requests):
+        handler()
+    return (time.process_time() - start) / requests * 1e6
+
+def main():
+    total_matches = int(sys.argv[1]) if len(sys.argv) > 1 else 1500
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    matches = synthetic_slate(total_matches)
+    last_update = datetime.now()
+
+    start = time.process_time()
+    snapshot = Snapshot(matches, last_update)
+    build_ms = (time.process_time() - start) * 1e3
+    payload = snapshot.payload
+
+    print(f"Slate: {total_matches} matches across {len(matches)} sports")
+    print(f"Snapshot build (once per cycle): {build_ms:.1f} ms CPU")
+    print("\nPayload size:")
+    print(f"  identity: {len(payload.body):>10,} bytes")
+    for encoding, (body, _) in payload.variants.items():
+        print(f"  {encoding:<8}: {len(body):>10,} bytes ({len(body) / len(payload.body):.1%})")
+
+    content = {'matches': matches, 'last_update': last_update}
+    handlers = {
+        'serialize per request (no feature)': lambda: encode_json(content),
+        'serialize + gzip per request': lambda: gzip.compress(encode_json(content), compresslevel=6),
+        'precompressed select, gzip': lambda: payload.select('gzip'),
+    }
+    if brotli is not None:
+        handlers['serialize + brotli per request'] = lambda: brotli.compress(encode_json(content), quality=5)
+        handlers['precompressed select, br'] = lambda: payload.select('gzip, deflate, br')
+
+    print(f"\nPer-request CPU ({requests} requests each):")
+    for name, handler in handlers.items():
+        print(f"  {name:<36} {cpu_per_request(handler, requests):>12.1f} us")
+
+if __name__ == "__main__":
+    main()
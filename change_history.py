@@ -0,0 +1,92 @@
+import os
+from collections import deque
+from typing import Dict, List, Any, Optional, Tuple
+from match_diff import ADDED, REMOVED, SCORE_CHANGED, TIMER_CHANGED, CHANGE_KINDS
+
+HISTORY_SIZE = int(os.getenv('SPORTS_CHANGE_HISTORY', '500'))
+
+def merge_kind(first: str, last: str, kinds: set) -> Optional[str]:
+    """Net change kind of one match across several cycles, None if it cancels out"""
+    if first == ADDED:
+        return None if last == REMOVED else ADDED
+    if last == REMOVED:
+        return REMOVED
+    if last == ADDED:
+        return ADDED  # Removed and back again, clients just upsert it
+    return SCORE_CHANGED if SCORE_CHANGED in kinds else TIMER_CHANGED
+
+class ChangeHistory:
+    """Monotonic snapshot versions plus a bounded history of their changesets
+
+    Each recorded changeset produces the snapshot with the next version,
+    and versions only ever increase. since(v) merges every changeset after
+    v into one delta, or asks for a full resync when v is older than the
+    retained history.
+    """
+
+    def __init__(self, size: int = HISTORY_SIZE):
+        self.version = 0
+        # Oldest version a delta can still be computed from
+        self.base = 0
+        self._entries: 'deque[Tuple[int, Dict[str, Any]]]' = deque(maxlen=size)
+        # (producer id, producer version) of the last upstream cycle recorded
+        self._upstream: Tuple[Optional[str], int] = (None, 0)
+
+    def record(self, changes: Optional[Dict[str, Any]], version: Optional[int] = None,
+               reset: bool = False) -> int:
+        """Append a cycle's Changeset.to_dict() and return its version
+
+        The version never goes backwards: it is the given one if that is
+        ahead, else the next one. A jump forward by more than one, or reset,
+        drops the older deltas so clients holding older versions resync.
+        """
+        version = self.version + 1 if version is None else max(version, self.version + 1)
+        if reset or version > self.version + 1:
+            self._entries.clear()
+            self.base = version
+        else:
+            if len(self._entries) == self._entries.maxlen:
+                self.base = self._entries[0][0]
+            self._entries.append((version, changes or {}))
+        self.version = version
+        return version
+
+    def record_upstream(self, changes: Optional[Dict[str, Any]], producer: Optional[str],
+                        upstream_version: int) -> Optional[int]:
+        """Record a cycle from a feed producer, returning its local version or None for a repeat
+
+        The producer's versions are only used to drop repeats (e.g. the latest
+        cycle re-sent to a reconnecting subscriber) and to spot missed cycles.
+        Locally they are adopted while they move forward, so workers following
+        one producer agree on versions; a new producer or a skipped cycle
+        resets the history.
+        """
+        last_producer, last_version = self._upstream
+        if producer == last_producer and upstream_version <= last_version:
+            return None
+        reset = producer != last_producer or upstream_version != last_version + 1
+        self._upstream = (producer, upstream_version)
+        return self.record(changes, upstream_version, reset=reset)
+
+    def since(self, version: int) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """Merged changes after version, or None if the client must resync"""
+        if version < self.base or version > self.version:
+            return None
+        merged: Dict[Tuple[int, str], Dict[str, Any]] = {}
+        first: Dict[Tuple[int, str], str] = {}
+        kinds: Dict[Tuple[int, str], set] = {}
+        for entry_version, changes in self._entries:
+            if entry_version <= version:
+                continue
+            for kind in CHANGE_KINDS:
+                for change in changes.get(kind, []):
+                    key = (change['sport_id'], change['id'])
+                    first.setdefault(key, kind)
+                    kinds.setdefault(key, set()).add(kind)
+                    merged[key] = change
+        delta = {kind: [] for kind in CHANGE_KINDS}
+        for key, change in merged.items():
+            kind = merge_kind(first[key], change['type'], kinds[key])
+            if kind is not None:
+                delta[kind].append(change if change['type'] == kind else {**change, 'type': kind})
+        return delta
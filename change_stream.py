@@ -0,0 +1,122 @@
+"""Server-Sent Events push stream of per-match changes
+
+Each cycle's changeset is flattened into one event per match and fanned
+out to every connected client whose sport/league filter matches, so
+clients only pay for what changed instead of re-polling the whole slate.
+"""
+
+import os
+import json
+import asyncio
+from typing import Dict, List, Any, AsyncIterator, Iterable, Optional, Set
+from match_diff import CHANGE_KINDS
+
+STREAM_BUFFER_SIZE = int(os.getenv('SPORTS_STREAM_BUFFER', '256'))
+STREAM_KEEPALIVE = float(os.getenv('SPORTS_STREAM_KEEPALIVE', '15'))
+
+# Sent instead of the backlog when a client falls too far behind; the
+# client should refetch /matches and keep listening
+RESYNC = 'resync'
+
+def format_event(event: str, data: Any, version: Optional[int] = None) -> bytes:
+    """One SSE frame; the id is the snapshot version, for Last-Event-ID resumes"""
+    frame = f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+    if version is not None:
+        frame = f"id: {version}\n{frame}"
+    return frame.encode('utf-8')
+
+def flatten_changes(changes: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Per-match events from a Changeset.to_dict() summary, without raw payloads"""
+    events = []
+    for kind in CHANGE_KINDS:
+        for entry in (changes or {}).get(kind, []):
+            events.append({key: value for key, value in entry.items() if key != 'match'})
+    return events
+
+class StreamClient:
+    """One connected client: its filters and a bounded outgoing buffer"""
+
+    def __init__(self, sports: Optional[Iterable[int]] = None, leagues: Optional[Iterable[str]] = None,
+                 buffer_size: int = STREAM_BUFFER_SIZE):
+        self.sports: Optional[Set[int]] = set(sports) if sports else None
+        # Leagues match by id or by case-insensitive name
+        self.leagues: Optional[Set[str]] = {str(league).lower() for league in leagues} if leagues else None
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=buffer_size)
+        self.dropped = 0
+
+    def wants(self, event: Dict[str, Any]) -> bool:
+        if self.sports is not None and event.get('sport_id') not in self.sports:
+            return False
+        if self.leagues is not None:
+            league_id = str(event.get('league_id'))
+            league = (event.get('league') or '').lower()
+            if league_id not in self.leagues and league not in self.leagues:
+                return False
+        return True
+
+    def push(self, frame: bytes):
+        """Queue a frame; a full buffer is replaced by a single resync marker"""
+        try:
+            self.queue.put_nowait(frame)
+        except asyncio.QueueFull:
+            self.dropped += self.queue.qsize()
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(format_event(RESYNC, {'dropped': self.dropped}))
+
+class ChangeBroadcaster:
+    """Fans each cycle's per-match changes out to the connected stream clients"""
+
+    def __init__(self, keepalive: float = STREAM_KEEPALIVE):
+        self.keepalive = keepalive
+        self._clients: Set[StreamClient] = set()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def subscribe(self, sports: Optional[Iterable[int]] = None,
+                  leagues: Optional[Iterable[str]] = None) -> StreamClient:
+        client = StreamClient(sports, leagues)
+        self._clients.add(client)
+        return client
+
+    def unsubscribe(self, client: StreamClient):
+        self._clients.discard(client)
+
+    def publish(self, changes: Optional[Dict[str, Any]], version: Optional[int] = None):
+        """Encode each change once and queue it for every client that wants it"""
+        if not self._clients:
+            return
+        for event in flatten_changes(changes):
+            frame = None
+            for client in self._clients:
+                if client.wants(event):
+                    frame = frame or format_event(event['type'], event, version)
+                    client.push(frame)
+
+    def resync(self, version: int):
+        """Tell every client to refetch, after cycles were missed"""
+        frame = format_event(RESYNC, {'version': version})
+        for client in self._clients:
+            client.push(frame)
+
+    def replay(self, client: StreamClient, changes: Optional[Dict[str, Any]], version: int):
+        """Queue a ChangeHistory delta for a resuming client, or a resync if it is too old"""
+        if changes is None:
+            client.push(format_event(RESYNC, {'version': version}))
+            return
+        for event in flatten_changes(changes):
+            if client.wants(event):
+                client.push(format_event(event['type'], event, version))
+
+    async def stream(self, client: StreamClient) -> AsyncIterator[bytes]:
+        """SSE frames for one client, with keepalive comments while idle"""
+        try:
+            yield format_event('ready', {'sports': sorted(client.sports) if client.sports else None})
+            while True:
+                try:
+                    yield await asyncio.wait_for(client.queue.get(), self.keepalive)
+                except asyncio.TimeoutError:
+                    yield b': keepalive\n\n'
+        finally:
+            self.unsubscribe(client)
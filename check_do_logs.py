@@ -1,4 +1,5 @@
 """Quick script to check Digital Ocean console messages"""
+import json
 import requests
 import os
 from dotenv import load_dotenv
@@ -10,20 +11,25 @@ load_dotenv()
 REMOTE_API_URL = "https://plankton-app-qyijl.ondigitalocean.app"
 
 def check_logs():
-    """Check latest console messages from Digital Ocean"""
+    """Check latest console messages from Digital Ocean, printed as they stream in"""
     try:
-        response = requests.get(f"{REMOTE_API_URL}/logs/build")
-        if response.status_code == 200:
-            data = response.json()
-            print("\nLatest Deployment Status:", data.get('status', 'Unknown'))
-            print("Created at:", data.get('created_at', 'Unknown'))
+        with requests.get(f"{REMOTE_API_URL}/logs/build", params={"format": "ndjson"}, stream=True) as response:
+            if response.status_code != 200:
+                print(f"Error: {response.status_code}")
+                print(response.text)
+                return
+            lines = response.iter_lines(decode_unicode=True)
+            info = json.loads(next(lines, '{}'))
+            print("\nLatest Deployment Status:", info.get('status', 'Unknown'))
+            print("Created at:", info.get('created_at', 'Unknown'))
             print("\nLatest Console Messages:")
             print("-" * 50)
-            for log in data.get('logs', []):
-                print(f"[{log['timestamp']}] {log['message']}")
-        else:
-            print(f"Error: {response.status_code}")
-            print(response.text)
+            for line in lines:
+                log = json.loads(line)
+                if 'error' in log:
+                    print(f"Error: {log['error']}")
+                else:
+                    print(f"[{log['timestamp']}] {log['message']}", flush=True)
     except Exception as e:
         print(f"Error connecting to Digital Ocean app: {str(e)}")
 
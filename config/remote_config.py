@@ -6,6 +6,7 @@ REMOTE_API_URL = "https://plankton-app-qyijl.ondigitalocean.app"
 # API endpoints
 MATCHES_ENDPOINT = f"{REMOTE_API_URL}/matches"
 LIVE_MATCHES_ENDPOINT = f"{REMOTE_API_URL}/live"
+STREAM_ENDPOINT = f"{REMOTE_API_URL}/matches/stream"
 HEALTH_CHECK_ENDPOINT = f"{REMOTE_API_URL}/health"
 
 # Whether to use remote or local processing
@@ -0,0 +1,231 @@
+"""Digital Ocean App Platform client for the build log endpoints
+
+python-digitalocean has no App Platform support, so this talks to the v2
+REST API directly (like fetch_all_logs.py). HTTP calls are blocking and
+run in worker threads; the async methods cache their results so the logs
+pages never stall live-match serving.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import requests
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, Iterator, List, Any, Optional, Union
+
+API_URL = 'https://api.digitalocean.com/v2'
+
+# Deployments in these phases never change again, nor do their build logs
+FINISHED_PHASES = {'ACTIVE', 'SUPERSEDED', 'ERROR', 'CANCELED'}
+
+# Streaming: bytes read per upstream chunk, chunks buffered ahead of a slow
+# client, and the most log lines kept in memory to cache a finished build
+CHUNK_SIZE = 16384
+STREAM_BUFFER_CHUNKS = 16
+MAX_CACHED_LOG_LINES = 50000
+
+# ttl for a cached value: seconds, None to keep it for good, 0 to not cache it
+TTL = Union[Optional[float], Callable[[Any], Optional[float]]]
+
+class DOError(Exception):
+    """Digital Ocean API failure, with the HTTP status to report to clients"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def parse_log_line(line: str) -> Dict[str, Any]:
+    """'<component> <timestamp> <message>' build log line -> log entry"""
+    component, _, rest = line.partition(' ')
+    timestamp, _, message = rest.partition(' ')
+    if timestamp[:4].isdigit() and 'T' in timestamp:
+        return {"timestamp": timestamp, "message": message, "type": "BUILD", "component": component}
+    return {"timestamp": None, "message": line, "type": "BUILD", "component": None}
+
+def is_finished(deployment: Dict[str, Any]) -> bool:
+    return deployment.get('phase') in FINISHED_PHASES
+
+class DOClient:
+    """Cached, non-blocking access to the app's deployments and build logs
+
+    The app id lookup and the deployment list are cached for ttl seconds;
+    finished deployments and their logs are cached until evicted. Concurrent
+    requests for the same uncached value share one upstream call.
+    """
+
+    def __init__(self, token: Optional[str] = None, app_name: Optional[str] = None,
+                 ttl: Optional[float] = None, max_entries: int = 256, timeout: float = 15.0):
+        self.token = token or os.getenv('DO_API_TOKEN')
+        self.app_name = app_name or os.getenv('DO_APP_NAME', 'plankton-app')
+        self.ttl = ttl if ttl is not None else float(os.getenv('DO_CACHE_TTL', '60'))
+        self.max_entries = max_entries
+        self.timeout = timeout
+        # requests.Session is not thread-safe, and every call runs in a worker thread
+        self._local = threading.local()
+        self._cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._inflight: Dict[tuple, asyncio.Future] = {}
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.token)
+
+    @property
+    def session(self) -> requests.Session:
+        """This thread's pooled session, created on its first call"""
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({
+                "Authorization": f"Bearer {self.token}",
+                "Content-Type": "application/json"
+            })
+            self._local.session = session
+        return session
+
+    def _get(self, path: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        response = self.session.get(f"{API_URL}{path}", params=params, timeout=self.timeout)
+        if response.status_code != 200:
+            raise DOError(502 if response.status_code >= 500 else response.status_code,
+                          f"Digital Ocean API error {response.status_code}: {response.text[:200]}")
+        return response.json()
+
+    def _find_app_id(self) -> str:
+        data = self._get('/apps', {'per_page': 200})
+        for app in data.get('apps', []):
+            if app.get('id') == self.app_name or app.get('spec', {}).get('name') == self.app_name:
+                return app['id']
+        raise DOError(404, "App not found")
+
+    def _iter_log_chunks(self, app_id: str, deployment_id: str) -> Iterator[List[str]]:
+        """Complete build log lines as each chunk downloads, never the whole file"""
+        data = self._get(f'/apps/{app_id}/deployments/{deployment_id}/logs', {'type': 'BUILD'})
+        for url in data.get('historic_urls') or []:
+            with self.session.get(url, stream=True, timeout=self.timeout) as response:
+                response.raise_for_status()
+                pending = b''
+                for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                    *lines, pending = (pending + chunk).split(b'\n')
+                    if lines:
+                        yield [line.decode('utf-8', 'replace') for line in lines if line]
+                if pending:
+                    yield [pending.decode('utf-8', 'replace')]
+
+    def _fetch_logs(self, app_id: str, deployment_id: str) -> List[Dict[str, Any]]:
+        return [parse_log_line(line) for lines in self._iter_log_chunks(app_id, deployment_id) for line in lines]
+
+    def _remember(self, key: tuple, value: Any, seconds: Optional[float]):
+        self._cache[key] = (None if seconds is None else time.monotonic() + seconds, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def _store(self, key: tuple, task: asyncio.Future, ttl: TTL):
+        self._inflight.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        value = task.result()
+        seconds = ttl(value) if callable(ttl) else ttl
+        if seconds != 0:
+            self._remember(key, value, seconds)
+
+    async def _cached(self, key: tuple, ttl: TTL, loader: Callable, *args: Any) -> Any:
+        entry = self._cache.get(key)
+        if entry is not None and (entry[0] is None or entry[0] > time.monotonic()):
+            self._cache.move_to_end(key)
+            return entry[1]
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(asyncio.to_thread(loader, *args))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._store(key, done, ttl))
+        # Shielded so one client disconnecting does not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def app_id(self) -> str:
+        return await self._cached(('app_id',), self.ttl, self._find_app_id)
+
+    async def deployments(self) -> List[Dict[str, Any]]:
+        """The app's deployments, newest first"""
+        app_id = await self.app_id()
+        data = await self._cached(('deployments', app_id), self.ttl, self._get, f'/apps/{app_id}/deployments')
+        return data.get('deployments', [])
+
+    async def deployment(self, deployment_id: str) -> Dict[str, Any]:
+        app_id = await self.app_id()
+        data = await self._cached(
+            ('deployment', deployment_id),
+            lambda data: None if is_finished(data.get('deployment', {})) else self.ttl,
+            self._get, f'/apps/{app_id}/deployments/{deployment_id}'
+        )
+        return data.get('deployment', {})
+
+    async def build_logs(self, deployment: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build log entries of a deployment, fetched once for finished deployments"""
+        app_id = await self.app_id()
+        return await self._cached(
+            ('logs', deployment['id']), None if is_finished(deployment) else 0,
+            self._fetch_logs, app_id, deployment['id']
+        )
+
+    async def stream_build_logs(self, deployment: Dict[str, Any]) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Batches of build log entries of a deployment as they download, with bounded memory
+
+        A download thread feeds a small bounded queue, so a slow client
+        throttles the download instead of buffering it. Finished deployments
+        are served from (and, if not too large, added to) the log cache.
+        """
+        key = ('logs', deployment['id'])
+        entry = self._cache.get(key)
+        if entry is not None and entry[0] is None:
+            for start in range(0, len(entry[1]), 1000):
+                yield entry[1][start:start + 1000]
+            return
+
+        app_id = await self.app_id()
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue(maxsize=STREAM_BUFFER_CHUNKS)
+        # Free queue slots; the download thread takes one before each put, so put_nowait never overflows
+        slots = threading.Semaphore(STREAM_BUFFER_CHUNKS)
+        stop = threading.Event()
+
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                if slots.acquire(timeout=0.5):
+                    try:
+                        loop.call_soon_threadsafe(chunks.put_nowait, item)
+                    except RuntimeError:  # The event loop has already shut down
+                        return False
+                    return True
+            return False
+
+        def download():
+            try:
+                for lines in self._iter_log_chunks(app_id, deployment['id']):
+                    if not put(lines):
+                        return
+            except Exception as e:
+                put(e)
+                return
+            put(None)
+
+        threading.Thread(target=download, name='do-log-stream', daemon=True).start()
+        collected: Optional[List[Dict[str, Any]]] = [] if is_finished(deployment) else None
+        try:
+            while True:
+                item = await chunks.get()
+                slots.release()
+                if item is None:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                logs = [parse_log_line(line) for line in item]
+                if collected is not None:
+                    collected.extend(logs)
+                    if len(collected) > MAX_CACHED_LOG_LINES:
+                        collected = None
+                yield logs
+            if collected is not None:
+                self._remember(key, collected, None)
+        finally:
+            stop.set()
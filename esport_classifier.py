@@ -0,0 +1,66 @@
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Any, Iterable, Optional, Tuple, Union
+
+ESPORT_KEYWORDS = ('esoccer', 'esports', 'e-', 'cyber', 'ebasketball', 'etennis', 'evolleyball', 'ehockey')
+
+class EsportClassifier:
+    """E-sport league classifier with one compiled pattern and an LRU verdict cache
+
+    Verdicts are cached by league id when the payload has one, otherwise by
+    league name, since league names barely change between cycles.
+    """
+
+    def __init__(self, keywords: Iterable[str] = ESPORT_KEYWORDS, cache_size: Optional[int] = None):
+        # Longest first so the alternation never stops at a shorter prefix
+        alternatives = sorted(set(keywords), key=len, reverse=True)
+        self.pattern = re.compile('|'.join(re.escape(keyword) for keyword in alternatives), re.IGNORECASE)
+        self.cache_size = cache_size or int(os.getenv('ESPORT_CACHE_SIZE', '4096'))
+        self._cache: 'OrderedDict[Union[int, str], bool]' = OrderedDict()
+
+    def contains_keyword(self, text: str) -> bool:
+        """Uncached keyword scan, for free text such as log lines"""
+        return self.pattern.search(text) is not None
+
+    def is_esport(self, league_name: str, league_id: Any = None) -> bool:
+        """Check if the league is an e-sport league"""
+        key = league_id or league_name
+        verdict = self._cache.get(key)
+        if verdict is None:
+            verdict = self.contains_keyword(league_name or '')
+            self._cache[key] = verdict
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(key)
+        return verdict
+
+    def classify(self, matches: Iterable[Dict[str, Any]]) -> List[bool]:
+        """E-sport verdict for every raw in-play result, in order"""
+        is_esport = self.is_esport
+        verdicts = []
+        for match in matches:
+            league = match.get('league') or {}
+            verdicts.append(is_esport(league.get('name', ''), league.get('id')))
+        return verdicts
+
+    def split(self, matches: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Split raw in-play results into (real, esport) lists in one pass"""
+        real, esport = [], []
+        for match, verdict in zip(matches, self.classify(matches)):
+            (esport if verdict else real).append(match)
+        return real, esport
+
+_classifier: Optional[EsportClassifier] = None
+
+def get_classifier() -> EsportClassifier:
+    """Get the classifier shared by every module in this process"""
+    global _classifier
+    if _classifier is None:
+        _classifier = EsportClassifier()
+    return _classifier
+
+def is_esport(league_name: str, league_id: Any = None) -> bool:
+    """Check if the league is an e-sport league"""
+    return get_classifier().is_esport(league_name, league_id)
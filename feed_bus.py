@@ -0,0 +1,211 @@
+"""Local live-feed bus so only one process polls the sports API
+
+The producer publishes every cycle as one NDJSON line over a Unix socket:
+the full live snapshot plus that cycle's changeset. New subscribers get
+the latest message as soon as they connect.
+
+A second socket next to it (<path>.notify) carries the same messages
+without the matches, for workers that read the slate from the shared
+snapshot file and only need to know a new cycle is there.
+"""
+
+import os
+import time
+import json
+import socket
+import asyncio
+from functools import partial
+from datetime import datetime
+from typing import Dict, List, Any, AsyncIterator, Optional, Set, Tuple
+from loguru import logger
+
+DEFAULT_SOCKET_PATH = '/tmp/sports_feed.sock'
+
+def feed_socket_path() -> str:
+    return os.getenv('SPORTS_FEED_SOCKET', DEFAULT_SOCKET_PATH)
+
+def notify_socket_path(path: str) -> str:
+    return f"{path}.notify"
+
+def encode_message(message: Dict[str, Any]) -> Tuple[bytes, bytes]:
+    """The full feed line and the notification line, without the matches"""
+    notice = {key: value for key, value in message.items() if key != 'matches'}
+    return json.dumps(message).encode('utf-8') + b'\n', json.dumps(notice).encode('utf-8') + b'\n'
+
+def decode_message(line: bytes) -> Dict[str, Any]:
+    """Decode one feed line, restoring integer sport ids"""
+    message = json.loads(line)
+    message['matches'] = {int(sport_id): matches for sport_id, matches in message.get('matches', {}).items()}
+    return message
+
+class FeedPublisher:
+    """Unix-socket publisher with a bounded buffer per subscriber
+
+    Every message carries the full snapshot, so a slow subscriber whose
+    buffer fills up just loses its oldest messages and catches up on the
+    next one.
+    """
+
+    def __init__(self, path: Optional[str] = None, buffer_size: int = 8):
+        self.path = path or feed_socket_path()
+        self.buffer_size = buffer_size
+        # Versions continue from the wall clock in ms, so a restarted producer
+        # numbers its cycles past any version a client of the last one still holds
+        self.version = int(time.time() * 1000)
+        # Subscribers tell producers apart by this, to drop only repeats of the same one
+        self.producer_id = f"{os.getpid()}-{datetime.now().isoformat()}"
+        self.latest: Optional[bytes] = None
+        self.latest_notice: Optional[bytes] = None
+        # Subscriber queue -> whether it only gets notifications
+        self._subscribers: Dict[asyncio.Queue, bool] = {}
+        # Connection handler tasks, cancelled on close()
+        self._connections: Set[asyncio.Task] = set()
+        self._servers: List[asyncio.AbstractServer] = []
+
+    def _producer_running(self) -> bool:
+        if not os.path.exists(self.path):
+            return False
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.path)
+            return True
+        except OSError:
+            return False
+        finally:
+            probe.close()
+
+    async def start(self) -> bool:
+        """Start serving; returns False if another producer already owns the socket"""
+        if self._producer_running():
+            logger.warning(f"⚠️ Another feed producer is already serving {self.path}, not publishing")
+            return False
+        for path, notify in ((self.path, False), (notify_socket_path(self.path), True)):
+            if os.path.exists(path):
+                os.unlink(path)  # Stale socket left by a dead producer
+            self._servers.append(await asyncio.start_unix_server(
+                partial(self._handle_subscriber, notify=notify), path=path
+            ))
+        return True
+
+    async def close(self):
+        if self._servers:
+            for server in self._servers:
+                server.close()
+            connections = list(self._connections)
+            for task in connections:
+                task.cancel()
+            await asyncio.gather(*connections, return_exceptions=True)
+            for server in self._servers:
+                await server.wait_closed()
+            self._servers = []
+            for path in (self.path, notify_socket_path(self.path)):
+                if os.path.exists(path):
+                    os.unlink(path)
+
+    async def _handle_subscriber(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                                 notify: bool = False):
+        queue = asyncio.Queue(maxsize=self.buffer_size)
+        latest = self.latest_notice if notify else self.latest
+        if latest is not None:
+            queue.put_nowait(latest)
+        self._subscribers[queue] = notify
+        self._connections.add(asyncio.current_task())
+        # Subscribers never send anything, so this only completes once they hang up;
+        # one-shot readers (latest(), read_latest) are dropped then, not on the next publish
+        hangup = asyncio.ensure_future(reader.read())
+        try:
+            while True:
+                message = asyncio.ensure_future(queue.get())
+                await asyncio.wait({message, hangup}, return_when=asyncio.FIRST_COMPLETED)
+                if not message.done():
+                    message.cancel()
+                    break
+                writer.write(message.result())
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            hangup.cancel()
+            self._subscribers.pop(queue, None)
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def publish(self, matches_by_sport: Dict[int, List[Dict[str, Any]]],
+                      changes: Optional[Dict[str, Any]] = None, **extra: Any):
+        """Encode a cycle once, off the event loop, and queue it for every subscriber"""
+        if not self._servers:
+            return
+        self.version += 1
+        message = {
+            'type': 'snapshot',
+            'producer': self.producer_id,
+            'version': self.version,
+            'timestamp': datetime.now().isoformat(),
+            'matches': matches_by_sport,
+            'changes': changes,
+            **extra
+        }
+        self.latest, self.latest_notice = await asyncio.to_thread(encode_message, message)
+        for queue, notify in self._subscribers.items():
+            if queue.full():
+                queue.get_nowait()  # Drop the oldest message for slow subscribers
+            queue.put_nowait(self.latest_notice if notify else self.latest)
+
+class FeedSubscriber:
+    """Reads cycles published by the feed producer
+
+    With notify=True it reads the notification socket instead, whose
+    messages carry no matches.
+    """
+
+    def __init__(self, path: Optional[str] = None, retry_delay: float = 5.0, notify: bool = False):
+        path = path or feed_socket_path()
+        self.path = notify_socket_path(path) if notify else path
+        self.retry_delay = retry_delay
+
+    async def messages(self) -> AsyncIterator[Dict[str, Any]]:
+        """Yield every published cycle, reconnecting whenever the producer goes away"""
+        while True:
+            try:
+                reader, writer = await asyncio.open_unix_connection(self.path, limit=2 ** 26)
+            except OSError:
+                await asyncio.sleep(self.retry_delay)
+                continue
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    # A full slate takes a while to parse, so keep it off the event loop
+                    yield await asyncio.to_thread(decode_message, line)
+            finally:
+                writer.close()
+            await asyncio.sleep(self.retry_delay)
+
+    async def latest(self, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+        """Get the producer's latest cycle, or None if no producer is serving one"""
+        try:
+            reader, writer = await asyncio.wait_for(asyncio.open_unix_connection(self.path, limit=2 ** 26), timeout)
+        except (OSError, asyncio.TimeoutError):
+            return None
+        try:
+            line = await asyncio.wait_for(reader.readline(), timeout)
+            return await asyncio.to_thread(decode_message, line) if line else None
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            writer.close()
+
+def read_latest(path: Optional[str] = None, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+    """Blocking variant of FeedSubscriber.latest for synchronous callers"""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path or feed_socket_path())
+        with sock.makefile('rb') as stream:
+            line = stream.readline()
+        return decode_message(line) if line else None
+    except OSError:
+        return None
+    finally:
+        sock.close()
@@ -61,9 +61,11 @@ def get_build_logs(deployment_id, component="autosportsgpt"):
     if response.status_code == 200:
         data = response.json()
         if "historic_urls" in data and data["historic_urls"]:
-            build_log_url = data["historic_urls"][0]
-            build_logs = requests.get(build_log_url).text
-            print(build_logs)
+            # Print lines as they download instead of loading the whole log first
+            for build_log_url in data["historic_urls"]:
+                with requests.get(build_log_url, stream=True) as log_response:
+                    for line in log_response.iter_lines(decode_unicode=True):
+                        print(line, flush=True)
         else:
             print("No build logs found")
     else:
@@ -0,0 +1,50 @@
+"""Live matches for the secondary consumers (the agents and the GPT loop)
+
+They read the feed producer's latest cycle when one is running, and only
+poll the sports API themselves otherwise, at a lower quota priority than
+the producer and with the same e-sport filtering and parsing it applies.
+"""
+
+from typing import Dict, List, Any, Optional
+from loguru import logger
+from request_scheduler import PRIORITY_UPCOMING
+from sports_fetcher import SportsFetcher
+from feed_bus import FeedSubscriber
+from esport_classifier import get_classifier
+from period_resolver import get_resolver
+from match_model import Match
+
+class LiveMatchClient:
+    """Per-sport live matches from the feed bus, falling back to a low-priority API call"""
+
+    def __init__(self, priority: int = PRIORITY_UPCOMING, fetcher: Optional[SportsFetcher] = None):
+        self.fetcher = fetcher or SportsFetcher(priority=priority)
+        self.esport_classifier = get_classifier()
+        self.period_resolver = get_resolver()
+
+    async def raw_matches(self, sport_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Raw in-play results for one sport, stamped with sport_id, or None if they could not be fetched"""
+        snapshot = await FeedSubscriber().latest()
+        if snapshot is not None:
+            return snapshot['matches'].get(sport_id, [])
+        try:
+            raws = await self.fetcher.fetch_sport(sport_id)
+        except Exception as e:
+            logger.error(f"❌ Error fetching sport {sport_id}: {str(e)}")
+            return None
+        if raws is None:
+            return None
+        # The producer only ever publishes real matches, so filter the fallback the same way
+        real_raws, _ = self.esport_classifier.split(raws)
+        return real_raws
+
+    async def matches(self, sport_id: int) -> Optional[List[Match]]:
+        """Parsed live matches for one sport, or None if they could not be fetched"""
+        raws = await self.raw_matches(sport_id)
+        if raws is None:
+            return None
+        periods = self.period_resolver.resolve_many(raws, sport_id)
+        return [Match.from_api(raw, sport_id, period=period) for raw, period in zip(raws, periods)]
+
+    async def close(self):
+        await self.fetcher.close()
@@ -1,13 +1,14 @@
 """Local monitor that uses the remote Digital Ocean API"""
 
 import os
+import json
 import requests
 import time
 from dotenv import load_dotenv
 from loguru import logger
 from config.remote_config import (
     MATCHES_ENDPOINT,
-    LIVE_MATCHES_ENDPOINT,
+    STREAM_ENDPOINT,
     HEALTH_CHECK_ENDPOINT
 )
 
@@ -26,18 +27,74 @@ def check_remote_health():
         logger.error(f"Error checking remote health: {e}")
         return False
 
+# Only what the monitor renders, not the whole raw payload
+MONITOR_FIELDS = 'sport_id,league,home,away,score,minute,period'
+
 def get_live_matches():
-    """Get live matches from the remote API"""
+    """Get the live snapshot (matches and its version) from the remote API, page by page"""
     try:
-        response = requests.get(LIVE_MATCHES_ENDPOINT)
-        if response.status_code == 200:
-            return response.json()
-        logger.error(f"Error getting live matches: {response.status_code}")
-        return None
+        params = {'fields': MONITOR_FIELDS, 'limit': 1000}
+        snapshot = {'matches': [], 'version': None}
+        while True:
+            response = requests.get(MATCHES_ENDPOINT, params=params)
+            if response.status_code != 200:
+                logger.error(f"Error getting live matches: {response.status_code}")
+                return None
+            page = response.json()
+            if snapshot['version'] is not None and page['version'] != snapshot['version']:
+                # The snapshot moved on while paging, start over on the new one
+                params.pop('cursor', None)
+                snapshot = {'matches': [], 'version': None}
+                continue
+            snapshot['version'] = page['version']
+            snapshot['matches'].extend(page['matches'])
+            if not page.get('next_cursor'):
+                return snapshot
+            params['cursor'] = page['next_cursor']
     except Exception as e:
         logger.error(f"Error getting live matches: {e}")
         return None
 
+def print_matches(matches):
+    """Print the full live snapshot"""
+    print("\n" + "="*50)
+    print("Live Matches:")
+    print("="*50)
+    for match in matches:
+        print(f"\n{match['league']}")
+        print(f"{match['home']} {match['score'] or '0-0'} {match['away']}")
+        print(f"⏰ {match['minute']}' ({match['period']})")
+
+def print_change(change):
+    """Print one pushed match change"""
+    print(f"[{change['type']}] {change.get('league') or ''}: "
+          f"{change.get('home')} {change.get('score') or '0-0'} {change.get('away')} "
+          f"⏰ {change.get('minute', 0)}' ({change.get('period', '-')})")
+
+def follow_changes(state):
+    """Print changes pushed by the remote API until the stream drops
+
+    Resumes from state['version'] so the server only replays what was
+    missed. Returns True if the client fell behind and needs a fresh snapshot.
+    """
+    headers = {'Last-Event-ID': str(state['version'])} if state.get('version') is not None else {}
+    with requests.get(STREAM_ENDPOINT, headers=headers, stream=True, timeout=(10, 60)) as response:
+        response.raise_for_status()
+        event = None
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith('id:'):
+                state['version'] = int(line[3:].strip())
+            elif line.startswith('event:'):
+                event = line[6:].strip()
+            elif line.startswith('data:') and event:
+                if event == 'resync':
+                    return True
+                if event != 'ready':
+                    print_change(json.loads(line[5:]))
+            elif not line:
+                event = None
+    return False
+
 def main():
     """Main function to monitor matches using the remote API"""
     logger.info("Starting local monitor using remote API...")
@@ -50,19 +107,22 @@ def main():
     logger.info("Remote API is healthy. Starting monitoring...")
     
     try:
+        state = {'version': None}
         while True:
-            matches = get_live_matches()
-            if matches:
-                print("\n" + "="*50)
-                print("Live Matches:")
-                print("="*50)
-                for match in matches:
-                    print(f"\n{match['league_name']}")
-                    print(f"{match['sport_emoji']} {match['team1']} {match['score']} {match['team2']}")
-                    print(f"⏰ {match['time']} ({match['period']})")
-            
-            # Wait for 30 seconds before next update
-            time.sleep(30)
+            # Full snapshot only when starting or too far behind, then just the changes
+            if state['version'] is None:
+                snapshot = get_live_matches()
+                if snapshot:
+                    print_matches(snapshot['matches'])
+                    state['version'] = snapshot.get('version')
+            try:
+                if follow_changes(state):
+                    logger.warning("Fell behind the change stream, refreshing snapshot")
+                    state['version'] = None
+                    continue
+            except requests.RequestException as e:
+                logger.error(f"Change stream dropped: {e}")
+            time.sleep(5)
             
     except KeyboardInterrupt:
         logger.info("Stopping local monitor...")
@@ -0,0 +1,115 @@
+from typing import Dict, List, Any, Iterable, NamedTuple, Optional
+from match_model import Match
+
+# Change kinds, in the order they are reported
+ADDED = 'added'
+REMOVED = 'removed'
+SCORE_CHANGED = 'score_changed'
+TIMER_CHANGED = 'timer_changed'
+
+CHANGE_KINDS = (ADDED, REMOVED, SCORE_CHANGED, TIMER_CHANGED)
+
+class MatchChange(NamedTuple):
+    kind: str
+    sport_id: int
+    event_id: str
+    # The new match state, or the last known state for removed matches
+    match: Match
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Compact event for push consumers, plus the raw payload unless removed"""
+        match = self.match
+        event = {
+            'type': self.kind,
+            'sport_id': self.sport_id,
+            'id': self.event_id,
+            'league_id': match.league_id,
+            'league': match.league,
+            'home': match.home,
+            'away': match.away,
+            'score': match.score,
+            'minute': match.minute,
+            'period': match.period
+        }
+        if self.kind != REMOVED:
+            event['match'] = match.to_dict()
+        return event
+
+class Changeset:
+    """Compact per-cycle diff: every change plus a count of unchanged matches"""
+
+    def __init__(self, changes: List[MatchChange], unchanged: int):
+        self.changes = changes
+        self.unchanged = unchanged
+
+    def __bool__(self):
+        return bool(self.changes)
+
+    def __len__(self):
+        return len(self.changes)
+
+    def of_kind(self, kind: str) -> List[MatchChange]:
+        return [change for change in self.changes if change.kind == kind]
+
+    @property
+    def sport_ids(self) -> List[int]:
+        """Sports with at least one change, in first-seen order"""
+        return list(dict.fromkeys(change.sport_id for change in self.changes))
+
+    def changed_matches(self) -> List[Match]:
+        """Matches that are new or whose score moved"""
+        return [change.match for change in self.changes if change.kind in (ADDED, SCORE_CHANGED)]
+
+    def to_dict(self) -> Dict[str, Any]:
+        summary = {kind: [] for kind in CHANGE_KINDS}
+        for change in self.changes:
+            summary[change.kind].append(change.to_dict())
+        summary['unchanged'] = self.unchanged
+        return summary
+
+class SnapshotDiffer:
+    """Diffs each sport's new snapshot against the previous one, keyed by event id"""
+
+    def __init__(self):
+        self.previous: Dict[int, Dict[str, Match]] = {}
+
+    def diff(self, matches_by_sport: Dict[int, List[Match]],
+             sport_ids: Optional[Iterable[int]] = None) -> Changeset:
+        """Diff the given sports and remember their new state
+
+        Only sports in sport_ids (default: the keys of matches_by_sport) are
+        compared, so a sport that was not polled this cycle does not show up
+        as removed. A listed sport missing from matches_by_sport has no
+        live matches.
+        """
+        sport_ids = matches_by_sport.keys() if sport_ids is None else sport_ids
+        changes = []
+        unchanged = 0
+
+        for sport_id in sport_ids:
+            before = self.previous.get(sport_id, {})
+            after = {}
+            for match in matches_by_sport.get(sport_id, []):
+                event_id = match.id
+                after[event_id] = match
+
+                old = before.get(event_id)
+                if old is None:
+                    changes.append(MatchChange(ADDED, sport_id, event_id, match))
+                elif old.score_state != match.score_state:
+                    changes.append(MatchChange(SCORE_CHANGED, sport_id, event_id, match))
+                elif old.timer_state != match.timer_state:
+                    changes.append(MatchChange(TIMER_CHANGED, sport_id, event_id, match))
+                else:
+                    unchanged += 1
+
+            for event_id, match in before.items():
+                if event_id not in after:
+                    changes.append(MatchChange(REMOVED, sport_id, event_id, match))
+
+            if after:
+                self.previous[sport_id] = after
+            else:
+                self.previous.pop(sport_id, None)
+
+        return Changeset(changes, unchanged)
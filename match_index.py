@@ -0,0 +1,126 @@
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Any, Iterable, Optional, Set, Tuple
+from match_model import Match
+from period_resolver import get_resolver
+
+# Fields a client can project with fields=, read from the parsed Match
+FIELDS = (
+    'id', 'sport_id', 'league_id', 'league', 'home', 'away', 'score',
+    'home_score', 'away_score', 'minute', 'second', 'period', 'time_status'
+)
+
+# Query parameters that select the filtered, paginated /matches form
+QUERY_PARAMS = frozenset({'sport', 'league', 'team', 'min_minute', 'live', 'fields', 'cursor', 'limit'})
+
+def trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+def parse_cursor(cursor: str) -> Tuple[int, str]:
+    """'<sport_id>:<event_id>' -> sort key, raises ValueError if malformed"""
+    sport_id, _, event_id = cursor.partition(':')
+    if not event_id:
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return int(sport_id), event_id
+
+def project(match: Match, fields: Optional[List[str]]) -> Dict[str, Any]:
+    """The raw payload, or only the requested parsed fields"""
+    if not fields:
+        return match.raw
+    return {field: getattr(match, field) for field in fields}
+
+class MatchIndex:
+    """Per-snapshot indexes for filtered, paginated match queries
+
+    Matches are kept in (sport_id, event_id) order, and every index holds
+    ascending positions into that order, so a query intersects the
+    smallest candidate lists instead of scanning the slate, and a cursor
+    is just the last key returned.
+    """
+
+    def __init__(self, matches: Iterable[Match]):
+        parsed = sorted(matches, key=lambda match: (match.sport_id, match.id))
+        self.matches = parsed
+        self.keys = [(match.sport_id, match.id) for match in parsed]
+
+        self.by_id: Dict[str, Match] = {match.id: match for match in parsed}
+        self.by_sport: Dict[int, List[int]] = {}
+        self.by_league: Dict[str, List[int]] = {}
+        self.by_team: Dict[str, List[int]] = {}
+        self.by_trigram: Dict[str, Set[int]] = {}
+        self.live: List[int] = []
+        self.not_live: List[int] = []
+        by_minute = []
+        for position, match in enumerate(parsed):
+            self.by_sport.setdefault(match.sport_id, []).append(position)
+            # Leagues are looked up by id or by case-insensitive name
+            for league_key in {str(match.league_id), match.league.lower()}:
+                self.by_league.setdefault(league_key, []).append(position)
+            for team in {match.home.lower(), match.away.lower()}:
+                self.by_team.setdefault(team, []).append(position)
+                for gram in trigrams(team):
+                    self.by_trigram.setdefault(gram, set()).add(position)
+            (self.live if match.time_status == '1' else self.not_live).append(position)
+            by_minute.append((match.minute, position))
+        by_minute.sort()
+        self.minutes = [minute for minute, _ in by_minute]
+        self.minute_positions = [position for _, position in by_minute]
+
+    @classmethod
+    def from_raw(cls, matches_by_sport: Dict[int, List[Dict[str, Any]]]) -> 'MatchIndex':
+        """Index raw API payloads keyed by sport_id, e.g. as read back from the feed bus"""
+        resolver = get_resolver()
+        return cls(
+            Match.from_api(raw, sport_id, period=period)
+            for sport_id, raws in matches_by_sport.items()
+            for raw, period in zip(raws, resolver.resolve_many(raws, sport_id))
+        )
+
+    def __len__(self) -> int:
+        return len(self.matches)
+
+    def get(self, event_id: str) -> Optional[Match]:
+        return self.by_id.get(event_id)
+
+    def _team_positions(self, team: str) -> Set[int]:
+        team = team.lower()
+        if len(team) < 3:
+            # Too short for trigrams, scan the distinct team names instead
+            return {position for name, positions in self.by_team.items() if team in name for position in positions}
+        grams = sorted((self.by_trigram.get(gram, set()) for gram in trigrams(team)), key=len)
+        candidates = set.intersection(*grams) if grams else set()
+        return {position for position in candidates
+                if team in self.matches[position].home.lower() or team in self.matches[position].away.lower()}
+
+    def query(self, sports: Optional[Iterable[int]] = None, leagues: Optional[Iterable[str]] = None,
+              team: Optional[str] = None, min_minute: Optional[int] = None, live: Optional[bool] = None,
+              cursor: Optional[str] = None, limit: int = 100) -> Tuple[List[Match], Optional[str]]:
+        """One page of matches passing every given filter, and the cursor for the next page"""
+        candidates: List[Iterable[int]] = []
+        if sports:
+            candidates.append([position for sport_id in sports for position in self.by_sport.get(sport_id, [])])
+        if leagues:
+            candidates.append([position for league in leagues for position in self.by_league.get(str(league).lower(), [])])
+        if team:
+            candidates.append(self._team_positions(team))
+        if min_minute is not None:
+            candidates.append(self.minute_positions[bisect_left(self.minutes, min_minute):])
+        if live is not None:
+            candidates.append(self.live if live else self.not_live)
+
+        if candidates:
+            candidates.sort(key=len)
+            selected = set(candidates[0])
+            for positions in candidates[1:]:
+                selected.intersection_update(positions)
+            positions = sorted(selected)
+        else:
+            positions = range(len(self.matches))
+
+        start = bisect_right(self.keys, parse_cursor(cursor)) if cursor else 0
+        positions = positions[bisect_left(positions, start):]
+        page = [self.matches[position] for position in positions[:limit]]
+        next_cursor = None
+        if len(positions) > limit:
+            last = page[-1]
+            next_cursor = f"{last.sport_id}:{last.id}"
+        return page, next_cursor
@@ -0,0 +1,226 @@
+"""Structured match log written next to the human-readable sports_monitor.log
+
+Each cycle with changes is appended with a single write: a cycle header,
+one compact record per live match, then a fixed-size trailer holding the
+header's offset. Readers seek to EOF - trailer, jump to the last cycle's
+header, and use its per-sport byte-offset index to read only what they need.
+
+Records are JSON lines, or length-prefixed msgpack when msgpack is installed
+and SPORTS_MATCH_LOG_FORMAT=msgpack. Files rotate daily and finished days
+are gzip-compressed in the background.
+"""
+
+import os
+import gzip
+import json
+import shutil
+import struct
+import threading
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from loguru import logger
+from match_model import Match
+
+try:
+    import msgpack
+except ImportError:  # msgpack is optional, JSON lines are always available
+    msgpack = None
+
+# Compact per-match record fields, read from the parsed Match
+RECORD_FIELDS = (
+    'id', 'sport_id', 'league_id', 'league', 'home', 'away', 'score',
+    'minute', 'second', 'period', 'time_status'
+)
+
+class JsonlCodec:
+    """One JSON object per line; the trailer is padded to a fixed width"""
+    suffix = '.jsonl'
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8') + b'\n'
+
+    def decode(self, data: bytes) -> List[Dict[str, Any]]:
+        return [json.loads(line) for line in data.splitlines() if line]
+
+    def read_one(self, f) -> Tuple[Dict[str, Any], int]:
+        line = f.readline()
+        return json.loads(line), len(line)
+
+    def trailer(self, header_offset: int) -> bytes:
+        return f'{{"type":"end","header":{header_offset:>20}}}\n'.encode('ascii')
+
+    def parse_trailer(self, data: bytes) -> int:
+        return json.loads(data)['header']
+
+    @property
+    def trailer_size(self) -> int:
+        return len(self.trailer(0))
+
+class MsgpackCodec:
+    """u32 length-prefixed msgpack maps; the trailer's offset is always a uint64"""
+    suffix = '.msgpack'
+    frame = struct.Struct('<I')
+
+    def encode(self, record: Dict[str, Any]) -> bytes:
+        body = msgpack.packb(record, use_bin_type=True)
+        return self.frame.pack(len(body)) + body
+
+    def decode(self, data: bytes) -> List[Dict[str, Any]]:
+        records = []
+        position = 0
+        while position < len(data):
+            (length,) = self.frame.unpack_from(data, position)
+            position += self.frame.size
+            records.append(msgpack.unpackb(data[position:position + length], raw=False))
+            position += length
+        return records
+
+    def read_one(self, f) -> Tuple[Dict[str, Any], int]:
+        (length,) = self.frame.unpack(f.read(self.frame.size))
+        return msgpack.unpackb(f.read(length), raw=False), self.frame.size + length
+
+    def trailer(self, header_offset: int) -> bytes:
+        # {"type": "end", "header": uint64} with the offset forced to 0xcf encoding
+        body = b'\x82\xa4type\xa3end\xa6header\xcf' + struct.pack('>Q', header_offset)
+        return self.frame.pack(len(body)) + body
+
+    def parse_trailer(self, data: bytes) -> int:
+        return msgpack.unpackb(data[self.frame.size:], raw=False)['header']
+
+    @property
+    def trailer_size(self) -> int:
+        return len(self.trailer(0))
+
+def get_codec(name: str):
+    if name == 'msgpack':
+        if msgpack is not None:
+            return MsgpackCodec()
+        logger.warning("⚠️ msgpack is not installed, writing the match log as JSON lines")
+    return JsonlCodec()
+
+def match_record(match: Match) -> Dict[str, Any]:
+    return {field: getattr(match, field) for field in RECORD_FIELDS}
+
+class MatchLogWriter:
+    """Appends one batched write per cycle to the day's structured match log"""
+
+    def __init__(self, directory: str, format: str = 'jsonl', prefix: str = 'matches'):
+        self.directory = directory
+        self.codec = get_codec(format)
+        self.prefix = prefix
+        self.cycle = 0
+        self._file = None
+        self._day: Optional[str] = None
+        self._last_header: Optional[int] = None
+        os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls) -> Optional['MatchLogWriter']:
+        """The writer configured by SPORTS_MATCH_LOG_DIR, or None if it is set empty"""
+        directory = os.getenv('SPORTS_MATCH_LOG_DIR', 'match_logs')
+        if not directory:
+            return None
+        return cls(directory, os.getenv('SPORTS_MATCH_LOG_FORMAT', 'jsonl'))
+
+    def path_for(self, day: str) -> str:
+        return os.path.join(self.directory, f"{self.prefix}-{day}{self.codec.suffix}")
+
+    def _open(self, day: str):
+        if self._file is not None:
+            self._file.close()
+        path = self.path_for(day)
+        # Every earlier day still uncompressed, including any left by a previous run
+        finished = [os.path.join(self.directory, name) for name in sorted(os.listdir(self.directory))
+                    if name.startswith(f"{self.prefix}-") and name.endswith(self.codec.suffix)
+                    and os.path.join(self.directory, name) != path]
+        if finished:
+            threading.Thread(target=compress_files, args=(finished,), name='match-log-gzip', daemon=True).start()
+        self._file = open(path, 'ab')
+        self._day = day
+        self._last_header = self._read_last_header_offset()
+
+    def _read_last_header_offset(self) -> Optional[int]:
+        """Header offset of the file's last complete cycle, to chain prev across restarts"""
+        try:
+            return read_last_header_offset(self._file.name, self.codec)
+        except (OSError, ValueError, KeyError, struct.error):
+            return None
+
+    def write_cycle(self, matches_by_sport: Dict[int, List[Match]], timestamp: Optional[datetime] = None):
+        """Append every live match of this cycle, grouped by sport, in one write"""
+        timestamp = timestamp or datetime.now()
+        day = timestamp.strftime('%Y-%m-%d')
+        if day != self._day:
+            self._open(day)
+
+        body = bytearray()
+        sports = {}
+        for sport_id, matches in sorted(matches_by_sport.items()):
+            start = len(body)
+            for match in matches:
+                body += self.codec.encode(match_record(match))
+            sports[str(sport_id)] = [start, len(body) - start, len(matches)]
+
+        self.cycle += 1
+        header = self.codec.encode({
+            'type': 'cycle',
+            'cycle': self.cycle,
+            'timestamp': timestamp.isoformat(),
+            'count': sum(count for _, _, count in sports.values()),
+            'size': len(body),
+            # sport_id -> [offset from the end of this header, bytes, matches]
+            'sports': sports,
+            'prev': self._last_header
+        })
+        header_offset = self._file.tell()
+        self._file.write(header + bytes(body) + self.codec.trailer(header_offset))
+        self._file.flush()
+        self._last_header = header_offset
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._day = None
+
+def compress_files(paths: List[str]):
+    """Gzip finished days' logs next to them and remove the originals"""
+    for path in paths:
+        try:
+            with open(path, 'rb') as source, gzip.open(f"{path}.gz", 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.remove(path)
+        except OSError as e:
+            logger.error(f"❌ Error compressing match log {path}: {str(e)}")
+
+def read_last_header_offset(path: str, codec=None) -> Optional[int]:
+    """Offset of the last complete cycle's header, or None for an empty log"""
+    codec = codec or codec_for(path)
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() < codec.trailer_size:
+            return None
+        f.seek(-codec.trailer_size, os.SEEK_END)
+        return codec.parse_trailer(f.read(codec.trailer_size))
+
+def codec_for(path: str):
+    return MsgpackCodec() if path.endswith(MsgpackCodec.suffix) else JsonlCodec()
+
+def read_cycle(path: str, header_offset: int, sport_id: Optional[int] = None) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """A cycle's header and its match records, optionally only one sport's"""
+    codec = codec_for(path)
+    with open(path, 'rb') as f:
+        f.seek(header_offset)
+        header, header_size = codec.read_one(f)
+        start, size = 0, header['size']
+        if sport_id is not None:
+            start, size, _ = header['sports'].get(str(sport_id), (0, 0, 0))
+        f.seek(header_offset + header_size + start)
+        return header, codec.decode(f.read(size))
+
+def read_last_cycle(path: str, sport_id: Optional[int] = None) -> Optional[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """The latest cycle of a match log, without reading anything before it"""
+    header_offset = read_last_header_offset(path)
+    if header_offset is None:
+        return None
+    return read_cycle(path, header_offset, sport_id)
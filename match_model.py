@@ -0,0 +1,85 @@
+from typing import Dict, Any, Optional, Tuple
+
+def _to_int(value: Any, default: int = 0) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def parse_score(ss: Optional[str]) -> Tuple[int, int]:
+    """Home and away score of the current segment, e.g. '6-4,3-2' -> (3, 2)"""
+    if not ss:
+        return 0, 0
+    home, _, away = ss.rsplit(',', 1)[-1].partition('-')
+    return _to_int(home.strip()), _to_int(away.strip())
+
+class Match:
+    """Normalized live match, parsed once per event per cycle
+
+    The raw API payload is kept in raw for serialization and for the rarely
+    used fields (stats, scores) that are not worth parsing up front.
+    """
+    __slots__ = (
+        'id', 'sport_id', 'league_id', 'league', 'home', 'away', 'score',
+        'home_score', 'away_score', 'minute', 'second', 'time_status',
+        'period', 'is_esport', 'raw'
+    )
+
+    def __init__(self, id: str, sport_id: int, league_id: int, league: str, home: str, away: str,
+                 score: str, home_score: int, away_score: int, minute: int, second: int,
+                 time_status: str, period: str, is_esport: bool, raw: Dict[str, Any]):
+        self.id = id
+        self.sport_id = sport_id
+        self.league_id = league_id
+        self.league = league
+        self.home = home
+        self.away = away
+        self.score = score
+        self.home_score = home_score
+        self.away_score = away_score
+        self.minute = minute
+        self.second = second
+        self.time_status = time_status
+        self.period = period
+        self.is_esport = is_esport
+        self.raw = raw
+
+    @classmethod
+    def from_api(cls, raw: Dict[str, Any], sport_id: int, period: str = '-', is_esport: bool = False) -> 'Match':
+        """Build a Match from one in-play result dict"""
+        league = raw.get('league') or {}
+        timer = raw.get('timer') or {}
+        score = raw.get('ss') or ''
+        home_score, away_score = parse_score(score)
+        return cls(
+            id=str(raw.get('id')),
+            sport_id=sport_id,
+            league_id=_to_int(league.get('id')),
+            league=league.get('name', 'Unknown League'),
+            home=(raw.get('home') or {}).get('name', 'Unknown'),
+            away=(raw.get('away') or {}).get('name', 'Unknown'),
+            score=score,
+            home_score=home_score,
+            away_score=away_score,
+            minute=_to_int(timer.get('tm')),
+            second=_to_int(timer.get('ts')),
+            time_status=str(raw.get('time_status', '')),
+            period=period,
+            is_esport=is_esport,
+            raw=raw
+        )
+
+    @property
+    def score_state(self) -> Tuple[str, str]:
+        return self.score, self.time_status
+
+    @property
+    def timer_state(self) -> Tuple[int, int, str]:
+        return self.minute, self.second, self.period
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The raw API payload, as served by the API and the feed bus"""
+        return self.raw
+
+    def __repr__(self):
+        return f"Match({self.id}, {self.home} {self.score or 'vs'} {self.away}, {self.minute}' {self.period})"
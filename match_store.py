@@ -0,0 +1,162 @@
+import os
+import time
+import queue
+import sqlite3
+import threading
+from typing import Dict, List, Any, Optional
+from loguru import logger
+from match_diff import Changeset
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS match_events (
+    recorded_at REAL NOT NULL,
+    event_id TEXT NOT NULL,
+    sport_id INTEGER NOT NULL,
+    league_id INTEGER,
+    league TEXT,
+    home TEXT,
+    away TEXT,
+    change TEXT NOT NULL,
+    score TEXT,
+    home_score INTEGER,
+    away_score INTEGER,
+    minute INTEGER,
+    period TEXT,
+    time_status TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_match_events_event ON match_events (event_id, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_match_events_sport ON match_events (sport_id, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_match_events_league ON match_events (league_id, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_match_events_time ON match_events (recorded_at);
+CREATE INDEX IF NOT EXISTS idx_match_events_home ON match_events (home, recorded_at);
+CREATE INDEX IF NOT EXISTS idx_match_events_away ON match_events (away, recorded_at);
+"""
+
+COLUMNS = (
+    'recorded_at', 'event_id', 'sport_id', 'league_id', 'league', 'home', 'away', 'change',
+    'score', 'home_score', 'away_score', 'minute', 'period', 'time_status'
+)
+
+INSERT = f"INSERT INTO match_events ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+
+class MatchHistory:
+    """Read-only queries over the match history a MatchStore writes
+
+    Safe to open in any process: it never creates the schema or starts a
+    writer, and reads nothing until the producer has created the file.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv('MATCH_STORE_PATH', 'match_history.db')
+
+    def _read(self, sql: str, params: tuple) -> List[Dict[str, Any]]:
+        if not os.path.exists(self.path):
+            return []  # Nothing recorded yet
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            rows = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+        return [dict(zip(COLUMNS, row)) for row in rows]
+
+    def query(self, event_id: Optional[str] = None, sport_id: Optional[int] = None,
+              league_id: Optional[int] = None, team: Optional[str] = None,
+              since: Optional[float] = None, until: Optional[float] = None,
+              limit: int = 1000) -> List[Dict[str, Any]]:
+        """Transitions matching every given filter, oldest first, within [since, until)"""
+        clauses, params = [], []
+        for column, value in (('event_id', event_id), ('sport_id', sport_id), ('league_id', league_id)):
+            if value is not None:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if team is not None:
+            clauses.append('(home = ? OR away = ?)')
+            params.extend((team, team))
+        if since is not None:
+            clauses.append('recorded_at >= ?')
+            params.append(since)
+        if until is not None:
+            clauses.append('recorded_at < ?')
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        sql = f"SELECT {', '.join(COLUMNS)} FROM match_events {where} ORDER BY recorded_at LIMIT ?"
+        return self._read(sql, (*params, limit))
+
+    def head_to_head(self, team1: str, team2: str, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Transitions of every recorded match between two teams, oldest first"""
+        sql = (
+            f"SELECT {', '.join(COLUMNS)} FROM match_events "
+            "WHERE (home = ? AND away = ?) OR (home = ? AND away = ?) ORDER BY recorded_at LIMIT ?"
+        )
+        return self._read(sql, (team1, team2, team2, team1, limit))
+
+class MatchStore(MatchHistory):
+    """Append-only SQLite history of match state transitions
+
+    record() only queues a cycle's rows; a background thread writes each
+    batch in one transaction, so the fetch loop never waits on disk. If the
+    writer falls behind and the queue fills up, batches are dropped rather
+    than blocking.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_pending: int = 1000):
+        super().__init__(path)
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+        self._pending: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._writer = threading.Thread(target=self._write_loop, name='match-store-writer', daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def record(self, changeset: Changeset, recorded_at: Optional[float] = None):
+        """Queue every transition in a cycle's changeset for writing"""
+        if not changeset:
+            return
+        recorded_at = recorded_at or time.time()
+        rows = [
+            (recorded_at, change.event_id, change.sport_id, change.match.league_id, change.match.league,
+             change.match.home, change.match.away, change.kind, change.match.score, change.match.home_score,
+             change.match.away_score, change.match.minute, change.match.period, change.match.time_status)
+            for change in changeset.changes
+        ]
+        try:
+            self._pending.put_nowait(rows)
+        except queue.Full:
+            logger.warning(f"⚠️ Match store writer is behind, dropped {len(rows)} transitions")
+
+    def _write_loop(self):
+        conn = self._connect()
+        while True:
+            batch = self._pending.get()
+            if batch is None:
+                break
+            rows = list(batch)
+            # Fold in anything else already queued so one commit covers it
+            while True:
+                try:
+                    more = self._pending.get_nowait()
+                except queue.Empty:
+                    break
+                if more is None:
+                    self._pending.put(None)
+                    break
+                rows.extend(more)
+            try:
+                with conn:
+                    conn.executemany(INSERT, rows)
+            except sqlite3.Error as e:
+                logger.error(f"❌ Error writing match history: {str(e)}")
+        conn.close()
+
+    def close(self):
+        """Flush pending writes and stop the writer thread"""
+        self._pending.put(None)
+        self._writer.join()
@@ -0,0 +1,148 @@
+"""Prometheus-style counters, gauges and histograms with text exposition
+
+Metrics are only updated from the event loop thread, so the hot path is a
+dict lookup and an add with no locks. Pipeline metrics live in the process
+that polls the sports API; server metrics in each API worker.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Any, Iterable, Tuple
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CYCLE_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class Metric:
+    kind = 'untyped'
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], Any] = {}
+
+    def header(self) -> List[str]:
+        return [f'# HELP {self.name} {self.help}', f'# TYPE {self.name} {self.kind}']
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, value in self.values.items():
+            lines.append(f'{self.name}{_labels(self.labelnames, labels)} {value}')
+        return lines
+
+class Counter(Metric):
+    kind = 'counter'
+
+    def inc(self, *labels: Any, amount: float = 1):
+        key = tuple(str(label) for label in labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+class Gauge(Metric):
+    kind = 'gauge'
+
+    def set(self, value: float, *labels: Any):
+        self.values[tuple(str(label) for label in labels)] = value
+
+class Histogram(Metric):
+    kind = 'histogram'
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = (),
+                 buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: Any):
+        key = tuple(str(label) for label in labels)
+        series = self.values.get(key)
+        if series is None:
+            # Per-bucket (non-cumulative) counts plus +Inf, then sum
+            series = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for labels, (counts, total) in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                le = 'le="+Inf"' if bound == float('inf') else f'le="{bound}"'
+                lines.append(f'{self.name}_bucket{_labels(self.labelnames, labels, le)} {cumulative}')
+            lines.append(f'{self.name}_sum{_labels(self.labelnames, labels)} {total}')
+            lines.append(f'{self.name}_count{_labels(self.labelnames, labels)} {cumulative}')
+        return lines
+
+class Registry:
+    """A named set of metrics rendered together"""
+
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+
+    def _add(self, metric: Metric) -> Any:
+        return self.metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._add(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        return self._add(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = (),
+                  buckets: Tuple[float, ...] = LATENCY_BUCKETS) -> Histogram:
+        return self._add(Histogram(name, help, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format 0.0.4"""
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+    def to_dict(self) -> Dict[str, Dict[str, Any]]:
+        """Plain summary: counters/gauges by label, histograms as count/sum/avg"""
+        summary = {}
+        for name, metric in self.metrics.items():
+            series = {}
+            for labels, value in metric.values.items():
+                key = ','.join(labels) or 'total'
+                if isinstance(metric, Histogram):
+                    count = sum(value[0])
+                    series[key] = {'count': count, 'sum': value[1], 'avg': value[1] / count if count else 0.0}
+                else:
+                    series[key] = value
+            summary[name] = series
+        return summary
+
+# Fetch pipeline, updated by whichever process polls the sports API
+PIPELINE = Registry()
+UPSTREAM_LATENCY = PIPELINE.histogram(
+    'sports_upstream_request_seconds', 'Latency of in-play API requests', ('sport',))
+UPSTREAM_RESPONSES = PIPELINE.counter(
+    'sports_upstream_responses_total', 'In-play API responses by HTTP status', ('status',))
+QUOTA_REMAINING = PIPELINE.gauge(
+    'sports_api_quota_remaining', 'Requests left in the hourly sports API budget')
+LIVE_MATCHES = PIPELINE.gauge(
+    'sports_live_matches', 'Live matches per sport after e-sport filtering', ('sport',))
+ESPORT_FILTERED = PIPELINE.counter(
+    'sports_esport_filtered_total', 'E-sport events dropped from in-play results', ('sport',))
+CYCLE_SECONDS = PIPELINE.histogram(
+    'sports_cycle_seconds', 'Duration of one fetch, classify and diff cycle', buckets=CYCLE_BUCKETS)
+
+# API serving, per worker
+SERVER = Registry()
+REQUEST_LATENCY = SERVER.histogram(
+    'http_request_duration_seconds', 'API latency until response headers, per endpoint', ('endpoint', 'method'))
+RESPONSES = SERVER.counter(
+    'http_responses_total', 'API responses per endpoint and status', ('endpoint', 'status'))
+SNAPSHOT_AGE = SERVER.gauge(
+    'sports_snapshot_age_seconds', 'Seconds since the served snapshot was published')
+SNAPSHOT_VERSION = SERVER.gauge(
+    'sports_snapshot_version', 'Version of the served snapshot')
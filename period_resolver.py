@@ -0,0 +1,105 @@
+from typing import Callable, Dict, List, Any, Iterable, Optional
+from sports_config import SUPPORTED_SPORTS, SPORT_SCORING
+
+# resolver(raw match, timer dict, minute) -> period label
+Resolver = Callable[[Dict[str, Any], Dict[str, Any], int], str]
+
+def _minute(timer: Dict[str, Any]) -> int:
+    try:
+        return int(timer.get('tm', 0))
+    except (TypeError, ValueError):
+        return 0
+
+def halves(half_length: int) -> Resolver:
+    """1H/2H from the match clock"""
+    return lambda raw, timer, minute: '1H' if minute <= half_length else '2H'
+
+def timer_field(field: str, label: str) -> Resolver:
+    """Period read straight from a timer field, e.g. timer['q'] -> 'Q3'"""
+    return lambda raw, timer, minute: label.format(timer.get(field, '1'))
+
+def score_segments(label: str) -> Resolver:
+    """Current set/game from the comma-separated score, e.g. '6-4,3-2' -> 'Set 2'"""
+    def resolve(raw, timer, minute):
+        score = raw.get('ss') or ''
+        return f'{label} {score.count(",") + 1}' if score else '-'
+    return resolve
+
+def innings(raw: Dict[str, Any], timer: Dict[str, Any], minute: int) -> str:
+    """Current inning from the per-inning entries in scores"""
+    scores = raw.get('scores') or {}
+    played = [int(key) for key in scores if str(key).isdigit()]
+    return f'Inning {max(played)}' if played else 'Inning 1'
+
+def darts(raw: Dict[str, Any], timer: Dict[str, Any], minute: int) -> str:
+    return f"Set {timer.get('set', '1')} Leg {timer.get('leg', '1')}"
+
+# Sport-specific rules, keyed like sports_config.SUPPORTED_SPORTS
+PERIOD_RULES: Dict[str, Resolver] = {
+    'soccer': halves(45),
+    'basketball': timer_field('q', 'Q{}'),
+    'tennis': score_segments('Set'),
+    'volleyball': timer_field('set', 'Set {}'),
+    'handball': halves(30),
+    'baseball': innings,
+    'ice_hockey': timer_field('p', 'P{}'),
+    'american_football': timer_field('q', 'Q{}'),
+    'snooker': timer_field('f', 'Frame {}'),
+    'darts': darts,
+    'table_tennis': timer_field('game', 'Game {}'),
+    'badminton': score_segments('Game'),
+    'rugby_league': halves(40),
+    'australian_rules': timer_field('q', 'Q{}'),
+    'beach_volleyball': timer_field('set', 'Set {}')
+}
+
+# Fallbacks by SPORT_SCORING main_stat for sports without a specific rule
+MAIN_STAT_RULES: Dict[str, Resolver] = {
+    'sets': score_segments('Set'),
+    'frames': timer_field('f', 'Frame {}')
+}
+
+def _no_period(raw: Dict[str, Any], timer: Dict[str, Any], minute: int) -> str:
+    return '-'
+
+def build_registry() -> Dict[int, Resolver]:
+    """Map every configured sport_id to its period resolver"""
+    registry = {}
+    for key, sport in SUPPORTED_SPORTS.items():
+        main_stat = SPORT_SCORING.get(key, {}).get('main_stat')
+        registry[sport['id']] = PERIOD_RULES.get(key) or MAIN_STAT_RULES.get(main_stat, _no_period)
+    return registry
+
+class PeriodResolver:
+    """O(1) per-sport dispatch to the period rules in PERIOD_RULES"""
+
+    def __init__(self, registry: Optional[Dict[int, Resolver]] = None):
+        self.registry = registry or build_registry()
+
+    def resolve(self, raw: Dict[str, Any], sport_id: int) -> str:
+        """Get the current period of the match, or '-' if it is not live"""
+        if raw.get('time_status') != '1':
+            return '-'
+        timer = raw.get('timer') or {}
+        return self.registry.get(sport_id, _no_period)(raw, timer, _minute(timer))
+
+    def resolve_many(self, raws: Iterable[Dict[str, Any]], sport_id: int) -> List[str]:
+        """Periods for a whole result list of one sport, dispatching once"""
+        resolver = self.registry.get(sport_id, _no_period)
+        periods = []
+        for raw in raws:
+            if raw.get('time_status') != '1':
+                periods.append('-')
+                continue
+            timer = raw.get('timer') or {}
+            periods.append(resolver(raw, timer, _minute(timer)))
+        return periods
+
+_resolver: Optional[PeriodResolver] = None
+
+def get_resolver() -> PeriodResolver:
+    """Get the resolver built at startup from sports_config"""
+    global _resolver
+    if _resolver is None:
+        _resolver = PeriodResolver()
+    return _resolver
@@ -0,0 +1,106 @@
+import os
+import time
+from typing import Dict, List, Any, Iterable, Optional
+from match_model import Match
+
+# Live match count at which a sport's interval is halved
+BUSY_MATCHES = 20
+
+# Empty polls after which the backoff stops doubling; far past any max_interval,
+# and keeps 2 ** streak from overflowing on a sport that stays empty for days
+MAX_BACKOFF_DOUBLINGS = 32
+
+def is_closing(match: Match) -> bool:
+    """Check if a live match is close to ending, where scores change fastest"""
+    if match.sport_id == 1:  # Soccer
+        return match.minute >= 80
+    if match.sport_id == 78:  # Handball
+        return match.minute >= 50
+    if match.sport_id == 18:  # Basketball
+        return match.period == 'Q4'
+    if match.sport_id == 17:  # Ice Hockey
+        return match.period == 'P3'
+    return False
+
+class SportCadence:
+    """Polling state for one sport"""
+    __slots__ = ('sport_id', 'interval', 'next_due', 'live_count', 'closing_count', 'empty_streak', 'reason')
+
+    def __init__(self, sport_id: int, interval: float):
+        self.sport_id = sport_id
+        self.interval = interval
+        self.next_due = 0.0
+        self.live_count = 0
+        self.closing_count = 0
+        self.empty_streak = 0
+        self.reason = 'initial'
+
+class AdaptivePollScheduler:
+    """Per-sport polling intervals driven by live match counts
+
+    Sports with many live or closing matches are polled more often; sports
+    that keep coming back empty back off exponentially up to max_interval.
+    """
+
+    def __init__(self, sport_ids: Iterable[int], base_interval: Optional[float] = None,
+                 min_interval: Optional[float] = None, max_interval: Optional[float] = None):
+        self.base_interval = base_interval or float(os.getenv('SPORTS_POLL_BASE_INTERVAL', '60'))
+        self.min_interval = min_interval or float(os.getenv('SPORTS_POLL_MIN_INTERVAL', '15'))
+        self.max_interval = max_interval or float(os.getenv('SPORTS_POLL_MAX_INTERVAL', '600'))
+        self.sports = {sport_id: SportCadence(sport_id, self.base_interval) for sport_id in sport_ids}
+
+    def due_sports(self, now: Optional[float] = None) -> List[int]:
+        """Sports whose next poll is due"""
+        now = time.monotonic() if now is None else now
+        return [sport_id for sport_id, state in self.sports.items() if state.next_due <= now]
+
+    def seconds_until_due(self, now: Optional[float] = None) -> float:
+        """Seconds until the next sport is due for polling"""
+        now = time.monotonic() if now is None else now
+        return max(0.0, min(state.next_due for state in self.sports.values()) - now)
+
+    def _clamp(self, interval: float) -> float:
+        return min(self.max_interval, max(self.min_interval, interval))
+
+    def record(self, sport_id: int, matches: List[Match], now: Optional[float] = None):
+        """Update a sport's interval from the matches its last poll returned"""
+        now = time.monotonic() if now is None else now
+        state = self.sports[sport_id]
+        state.live_count = len(matches)
+        state.closing_count = sum(1 for match in matches if is_closing(match))
+
+        if not matches:
+            state.empty_streak += 1
+            state.interval = self._clamp(self.base_interval * 2 ** min(state.empty_streak, MAX_BACKOFF_DOUBLINGS))
+            state.reason = f'empty x{state.empty_streak}'
+        elif state.closing_count:
+            state.empty_streak = 0
+            state.interval = self.min_interval
+            state.reason = f'{state.closing_count} closing'
+        else:
+            state.empty_streak = 0
+            state.interval = self._clamp(self.base_interval / (1 + state.live_count / BUSY_MATCHES))
+            state.reason = f'{state.live_count} live'
+        state.next_due = now + state.interval
+
+    def record_failure(self, sport_id: int, now: Optional[float] = None):
+        """Retry a failed sport after its current interval without changing it"""
+        now = time.monotonic() if now is None else now
+        state = self.sports[sport_id]
+        state.next_due = now + state.interval
+        state.reason = 'fetch failed'
+
+    def describe(self, now: Optional[float] = None) -> Dict[int, Dict[str, Any]]:
+        """Current cadence decision for every sport"""
+        now = time.monotonic() if now is None else now
+        return {
+            sport_id: {
+                'interval': round(state.interval, 1),
+                'next_poll_in': round(max(0.0, state.next_due - now), 1),
+                'live_matches': state.live_count,
+                'closing_matches': state.closing_count,
+                'empty_streak': state.empty_streak,
+                'reason': state.reason
+            }
+            for sport_id, state in self.sports.items()
+        }
@@ -0,0 +1,247 @@
+import os
+import math
+import time
+import sqlite3
+import asyncio
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+from loguru import logger
+
+# Priority classes, most important first: the feed producer's live polling,
+# then secondary pollers (agents, the GPT loop), then metadata lookups
+PRIORITY_LIVE = 0
+PRIORITY_UPCOMING = 1
+PRIORITY_METADATA = 2
+
+# Share of the hourly budget each priority class must leave untouched, so
+# live-score polling keeps getting tokens when the budget runs low
+PRIORITY_RESERVE = {
+    PRIORITY_LIVE: 0.0,
+    PRIORITY_UPCOMING: 0.2,
+    PRIORITY_METADATA: 0.5
+}
+
+# Below this share of the hourly budget, pollers stretch their intervals
+LOW_BUDGET_SHARE = 0.25
+
+HOUR = 3600.0
+MINUTE = 60.0
+
+def window_wait(grants: List[float], limit: float, seconds: float, now: float) -> float:
+    """Seconds until fewer than limit of the (sorted) grant times fall within the last seconds"""
+    start = bisect_right(grants, now - seconds)
+    excess = len(grants) - start - math.ceil(limit) + 1
+    if excess <= 0:
+        return 0.0
+    # The call that has to age out of the window before one more fits
+    return grants[start + excess - 1] + seconds - now
+
+QUOTA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quota_grants (at REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS quota_grants_at ON quota_grants (at);
+CREATE TABLE IF NOT EXISTS quota_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    paused_until REAL NOT NULL,
+    reported_remaining INTEGER,
+    reported_at REAL
+);
+"""
+
+def quota_db_path() -> str:
+    return os.getenv('SPORTS_API_QUOTA_DB', '/tmp/sports_api_quota.db')
+
+class SharedQuota:
+    """Grant times and upstream reports kept in SQLite, shared by every process on the host
+
+    Each scheduler operation loads the last hour of grants, updates them and
+    writes the new ones back in one IMMEDIATE transaction, so concurrent
+    processes draw from one budget.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.executescript(QUOTA_SCHEMA)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        # Quota state is cheap to lose, so skip the fsync on every commit
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=OFF')
+        return conn
+
+    @contextmanager
+    def locked(self, scheduler: 'RequestScheduler') -> Iterator[None]:
+        """Load the shared state into scheduler, then store its new grants and state back"""
+        conn = None
+        try:
+            conn = self._connect()
+            conn.execute('BEGIN IMMEDIATE')
+        except sqlite3.Error as e:
+            if conn is not None:
+                conn.close()
+            logger.error(f"❌ Error locking shared API quota {self.path}: {str(e)}")
+            yield
+            return
+        try:
+            conn.execute('DELETE FROM quota_grants WHERE at <= ?', (time.time() - HOUR,))
+            scheduler.grants = [at for (at,) in conn.execute('SELECT at FROM quota_grants ORDER BY at')]
+            scheduler.pending = []
+            row = conn.execute('SELECT paused_until, reported_remaining, reported_at FROM quota_state').fetchone()
+            if row is not None:
+                scheduler.paused_until = row[0]
+                scheduler.reported = None if row[1] is None else (row[1], row[2])
+            yield
+            conn.executemany('INSERT INTO quota_grants VALUES (?)', [(at,) for at in scheduler.pending])
+            scheduler.pending = []
+            reported = scheduler.reported or (None, None)
+            conn.execute('INSERT OR REPLACE INTO quota_state VALUES (1, ?, ?, ?)',
+                         (scheduler.paused_until, *reported))
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+class RequestScheduler:
+    """Central quota gate that every outbound sports-API call goes through
+
+    Calls are counted over sliding windows: at most the hourly budget in any
+    3600 seconds and the minute budget in any 60, so no clock hour can see
+    more than the budget. Lower priority classes stop short of the hourly
+    budget, and the upstream's own X-RateLimit-Remaining caps it further.
+
+    With a SharedQuota the grant times live in SQLite and are shared with
+    every other process on the host; without one they are per process.
+    Times are wall-clock so they mean the same thing in every process.
+    """
+
+    def __init__(self, hourly_budget: Optional[int] = None, minute_budget: Optional[int] = None,
+                 shared: Optional[SharedQuota] = None):
+        self.hourly_budget = hourly_budget or int(os.getenv('SPORTS_API_HOURLY_BUDGET', '1000'))
+        self.minute_budget = minute_budget or int(os.getenv('SPORTS_API_MINUTE_BUDGET', '60'))
+        # Wall-clock times of the calls granted in the last hour, oldest first
+        self.grants: List[float] = []
+        # Grants not yet written to the shared quota
+        self.pending: List[float] = []
+        # (remaining, wall-clock time) from the upstream's last X-RateLimit-Remaining
+        self.reported: Optional[Tuple[int, float]] = None
+        self.paused_until = 0.0
+        self.shared = shared
+        self.granted: Dict[int, int] = {priority: 0 for priority in PRIORITY_RESERVE}
+
+    @contextmanager
+    def _synced(self) -> Iterator[None]:
+        if self.shared is None:
+            del self.grants[:bisect_right(self.grants, time.time() - HOUR)]
+            yield
+        else:
+            with self.shared.locked(self):
+                yield
+
+    def _reported_left(self, now: float) -> Optional[int]:
+        """Calls the upstream has left by its last report, less those granted since"""
+        if self.reported is None or now - self.reported[1] >= HOUR:
+            return None
+        remaining, at = self.reported
+        return remaining - (len(self.grants) - bisect_left(self.grants, at))
+
+    def _wait_time(self, priority: int, now: float) -> float:
+        reserve = PRIORITY_RESERVE[priority] * self.hourly_budget
+        waits = [
+            self.paused_until - now,
+            window_wait(self.grants, self.hourly_budget - reserve, HOUR, now),
+            window_wait(self.grants, self.minute_budget, MINUTE, now)
+        ]
+        reported_left = self._reported_left(now)
+        if reported_left is not None and reported_left - reserve < 1:
+            # The upstream's window is unknown, so wait out the hour its report covers
+            waits.append(self.reported[1] + HOUR - now)
+        return max(waits)
+
+    def wait_time(self, priority: int = PRIORITY_LIVE) -> float:
+        """Seconds a call of the given priority would have to wait right now"""
+        with self._synced():
+            return self._wait_time(priority, time.time())
+
+    def _try_take(self, priority: int) -> float:
+        """Take a call if one is allowed now, else return the seconds to wait"""
+        with self._synced():
+            now = time.time()
+            delay = self._wait_time(priority, now)
+            if delay <= 0:
+                self.grants.append(now)
+                if self.shared is not None:
+                    self.pending.append(now)
+            return delay
+
+    async def acquire(self, priority: int = PRIORITY_LIVE):
+        """Wait until the budgets allow one more call, then take it"""
+        while True:
+            # A shared quota may briefly wait on another process's transaction
+            delay = await asyncio.to_thread(self._try_take, priority) if self.shared else self._try_take(priority)
+            if delay <= 0:
+                break
+            await asyncio.sleep(delay)
+        self.granted[priority] += 1
+
+    def _observe(self, remaining: Optional[int], status: int, retry_after: str):
+        with self._synced():
+            now = time.time()
+            if remaining is not None:
+                self.reported = (remaining, now)
+            if status == 429:
+                pause = int(retry_after) if retry_after.isdigit() else 60
+                self.paused_until = max(self.paused_until, now + pause)
+                logger.warning(f"⚠️ Sports API rate limited, pausing outbound calls for {pause}s")
+
+    async def observe_response(self, status: int, headers: Optional[Mapping[str, str]] = None):
+        """Record what the upstream reports about our quota"""
+        headers = headers or {}
+        remaining = headers.get('X-RateLimit-Remaining')
+        remaining = int(remaining) if remaining is not None and remaining.isdigit() else None
+        if remaining is None and status != 429:
+            return
+        args = (remaining, status, headers.get('Retry-After', ''))
+        if self.shared:
+            await asyncio.to_thread(self._observe, *args)
+        else:
+            self._observe(*args)
+
+    def remaining(self) -> int:
+        """Calls left in the hourly budget as of the last acquire or observed response
+
+        Never touches the shared quota, so it is safe to call on the event loop.
+        """
+        now = time.time()
+        left = self.hourly_budget - (len(self.grants) - bisect_right(self.grants, now - HOUR))
+        reported_left = self._reported_left(now)
+        return max(0, left if reported_left is None else min(left, reported_left))
+
+    def recommended_interval(self, base_interval: float) -> float:
+        """Stretch a poller's interval as the hourly budget runs low"""
+        share = self.remaining() / self.hourly_budget
+        if share >= LOW_BUDGET_SHARE:
+            return base_interval
+        return base_interval * LOW_BUDGET_SHARE / max(share, 0.05)
+
+_scheduler: Optional[RequestScheduler] = None
+
+def get_scheduler() -> RequestScheduler:
+    """Get this process's scheduler, drawing on the host-wide quota unless SPORTS_API_QUOTA_DB is empty"""
+    global _scheduler
+    if _scheduler is None:
+        path = quota_db_path()
+        shared = None
+        if path:
+            try:
+                shared = SharedQuota(path)
+            except sqlite3.Error as e:
+                logger.error(f"❌ Error opening shared API quota {path}, using a per-process budget: {str(e)}")
+        _scheduler = RequestScheduler(shared=shared)
+    return _scheduler
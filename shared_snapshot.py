@@ -0,0 +1,160 @@
+"""Memory-mapped snapshot file shared by every API worker on the host
+
+The feed producer writes each published Snapshot, already encoded and
+compressed, into one file; API workers running with SPORTS_FEED_ROLE=shared
+map it read-only and serve slices of it, so adding workers adds read
+throughput without adding fetch loops or per-worker encoding.
+
+Layout: MAGIC, u32 directory length, JSON directory, then the payload
+blobs the directory points at (offsets relative to the end of the directory).
+"""
+
+import os
+import json
+import mmap
+import struct
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from loguru import logger
+from snapshot import Snapshot, Payload, http_date
+from match_index import MatchIndex
+
+MAGIC = b'SPSNAP01'
+HEADER = struct.Struct('<8sI')
+DEFAULT_PATH = '/tmp/sports_snapshot.bin'
+
+def shared_snapshot_path() -> str:
+    return os.getenv('SPORTS_SHARED_SNAPSHOT') or DEFAULT_PATH
+
+class SharedSnapshotWriter:
+    """Writes snapshots for the readers; each write atomically replaces the file
+
+    Readers that still map the previous file keep a valid view of it until
+    they pick up the new one.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or shared_snapshot_path()
+        self.version = 0
+
+    def write(self, snapshot: Snapshot):
+        blobs: List[bytes] = []
+        offset = 0
+
+        def add(data: bytes, etag: str) -> list:
+            nonlocal offset
+            blobs.append(data)
+            entry = [offset, len(data), etag]
+            offset += len(data)
+            return entry
+
+        def describe(payload: Payload) -> Dict[str, Any]:
+            return {
+                'body': add(payload.body, payload.etag),
+                'variants': {encoding: add(body, etag) for encoding, (body, etag) in payload.variants.items()}
+            }
+
+        directory = json.dumps({
+            'version': snapshot.version,
+            'last_update': snapshot.last_update.isoformat() if snapshot.last_update else None,
+            'meta': snapshot.meta,
+            'payload': describe(snapshot.payload),
+            'sports': {str(sport_id): describe(payload) for sport_id, payload in snapshot.sport_payloads.items()},
+            'empty': describe(snapshot.empty_sport_payload)
+        }).encode('utf-8')
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(directory)))
+            f.write(directory)
+            for blob in blobs:
+                f.write(blob)
+        os.replace(temp_path, self.path)
+        self.version = snapshot.version
+
+class MappedSnapshot:
+    """Snapshot-compatible read-only view over a mapped snapshot file
+
+    Payload bodies are memoryviews into the mapping. The parsed matches and
+    the query index are built on first use; async servers should touch
+    index off the event loop (see SharedSnapshotReader.load_indexed).
+    """
+    __slots__ = (
+        'version', 'last_update', 'last_modified', 'meta', 'payload',
+        'sport_payloads', 'empty_sport_payload', '_mapping', '_matches', '_index'
+    )
+
+    def __init__(self, mapping: mmap.mmap):
+        magic, length = HEADER.unpack_from(mapping, 0)
+        if magic != MAGIC:
+            raise ValueError("Not a shared snapshot file")
+        directory = json.loads(mapping[HEADER.size:HEADER.size + length])
+        view = memoryview(mapping)[HEADER.size + length:]
+
+        def payload(entry: Dict[str, Any]) -> Payload:
+            def part(start: int, size: int, etag: str) -> Tuple[memoryview, str]:
+                return view[start:start + size], etag
+            body, etag = part(*entry['body'])
+            return Payload.from_parts(body, etag, {
+                encoding: part(*variant) for encoding, variant in entry['variants'].items()
+            })
+
+        last_update = directory['last_update']
+        self._mapping = mapping
+        self._matches = None
+        self._index = None
+        self.version = directory['version']
+        self.last_update = datetime.fromisoformat(last_update) if last_update else None
+        self.last_modified = http_date(self.last_update)
+        self.meta = directory['meta']
+        self.payload = payload(directory['payload'])
+        self.sport_payloads = {int(sport_id): payload(entry) for sport_id, entry in directory['sports'].items()}
+        self.empty_sport_payload = payload(directory['empty'])
+
+    def sport_payload(self, sport_id: int) -> Payload:
+        return self.sport_payloads.get(sport_id, self.empty_sport_payload)
+
+    @property
+    def matches(self) -> Dict[int, List[Dict[str, Any]]]:
+        if self._matches is None:
+            content = json.loads(bytes(self.payload.body))
+            self._matches = {int(sport_id): matches for sport_id, matches in content['matches'].items()}
+        return self._matches
+
+    @property
+    def index(self) -> MatchIndex:
+        if self._index is None:
+            self._index = MatchIndex.from_raw(self.matches)
+        return self._index
+
+class SharedSnapshotReader:
+    """Maps the shared snapshot file, remapping only when it has been replaced"""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or shared_snapshot_path()
+        self._identity: Optional[Tuple[int, int]] = None
+        self._snapshot: Optional[MappedSnapshot] = None
+
+    def load(self) -> Optional[MappedSnapshot]:
+        """The newest snapshot in the file, or None if the producer has not written one"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        identity = (stat.st_ino, stat.st_mtime_ns)
+        if identity != self._identity:
+            try:
+                with open(self.path, 'rb') as f:
+                    mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                self._snapshot = MappedSnapshot(mapping)
+                self._identity = identity
+            except (OSError, ValueError, struct.error) as e:
+                logger.error(f"❌ Error mapping shared snapshot {self.path}: {str(e)}")
+        return self._snapshot
+
+    def load_indexed(self) -> Optional[MappedSnapshot]:
+        """load(), with the query index already built; blocking, so run it in a thread"""
+        snapshot = self.load()
+        if snapshot is not None:
+            snapshot.index
+        return snapshot
@@ -0,0 +1,145 @@
+import os
+import gzip
+import json
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from match_index import MatchIndex
+from match_model import Match
+from typing import Dict, List, Any, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # Brotli is optional, gzip is always available
+    brotli = None
+
+# Bodies smaller than this are not worth compressing
+COMPRESS_MIN_BYTES = int(os.getenv('SNAPSHOT_COMPRESS_MIN_BYTES', '1024'))
+PRECOMPRESS = os.getenv('SNAPSHOT_PRECOMPRESS', '1') == '1'
+
+# Preferred content codings, best ratio first
+ENCODINGS = ('br', 'gzip') if brotli is not None else ('gzip',)
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=5)
+    return gzip.compress(body, compresslevel=6, mtime=0)
+
+def parse_accept_encoding(header: Optional[str]) -> Dict[str, float]:
+    """Content codings the client accepts, with their q-values"""
+    accepted = {}
+    for part in (header or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if not coding:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+def http_date(value: Optional[datetime]) -> Optional[str]:
+    """Last-Modified style date, e.g. 'Sun, 18 Oct 2026 09:30:00 GMT'"""
+    return format_datetime(value.astimezone(timezone.utc), usegmt=True) if value else None
+
+def encode_json(content: Any) -> bytes:
+    """Encode JSON the same way FastAPI's JSONResponse does"""
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':'),
+                      default=_json_default).encode('utf-8')
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+class Payload:
+    """Immutable pre-encoded response body with its strong ETag
+
+    Compressed variants are built once here, alongside the identity body,
+    so requests never compress anything. Each variant has its own ETag as
+    it is a different representation.
+    """
+    __slots__ = ('body', 'etag', 'variants')
+
+    def __init__(self, content: Any, precompress: bool = PRECOMPRESS):
+        self.body = encode_json(content)
+        digest = hashlib.blake2b(self.body, digest_size=16).hexdigest()
+        self.etag = f'"{digest}"'
+        self.variants: Dict[str, Tuple[bytes, str]] = {}
+        if precompress and len(self.body) >= COMPRESS_MIN_BYTES:
+            for encoding in ENCODINGS:
+                self.variants[encoding] = (compress(self.body, encoding), f'"{digest}-{encoding}"')
+
+    @classmethod
+    def from_parts(cls, body: bytes, etag: str, variants: Dict[str, Tuple[bytes, str]]) -> 'Payload':
+        """Wrap bytes encoded elsewhere (e.g. slices of the shared snapshot file)"""
+        payload = cls.__new__(cls)
+        payload.body = body
+        payload.etag = etag
+        payload.variants = variants
+        return payload
+
+    def select(self, accept_encoding: Optional[str]) -> Tuple[Optional[str], bytes, str]:
+        """Pick (content coding, body, ETag) for a request's Accept-Encoding"""
+        if self.variants:
+            accepted = parse_accept_encoding(accept_encoding)
+            wildcard = accepted.get('*', 0.0)
+            for encoding in ENCODINGS:
+                if accepted.get(encoding, wildcard) > 0:
+                    body, etag = self.variants[encoding]
+                    return encoding, body, etag
+        return None, self.body, self.etag
+
+    @staticmethod
+    def matches_etag(etag: str, if_none_match: Optional[str]) -> bool:
+        """Check an If-None-Match header against an ETag (weak comparison, RFC 9110)"""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == '*':
+            return True
+        return any(tag.strip().removeprefix('W/') == etag for tag in if_none_match.split(','))
+
+class Snapshot:
+    """Immutable view of one published cycle with every response pre-encoded
+
+    Built once per cycle off the event loop, then published with a single
+    reference assignment, so request handlers always see a consistent,
+    fully indexed view and never serialize the slate themselves.
+    """
+    __slots__ = (
+        'matches', 'last_update', 'version', 'meta', 'last_modified',
+        'payload', 'sport_payloads', 'empty_sport_payload', 'index'
+    )
+
+    def __init__(self, matches: Dict[int, List[Dict[str, Any]]], last_update: Optional[datetime], version: int = 0,
+                 meta: Optional[Dict[str, Any]] = None, parsed: Optional[Dict[int, List[Match]]] = None):
+        init = super().__setattr__
+        init('matches', matches)
+        init('last_update', last_update)
+        init('version', version)
+        # Producer-side details published with the cycle, e.g. cadence and quota
+        init('meta', meta or {})
+        init('last_modified', http_date(last_update))
+        init('payload', Payload({'matches': matches, 'last_update': last_update, 'version': version}))
+        init('sport_payloads', {
+            sport_id: Payload({'matches': sport_matches, 'last_update': last_update, 'version': version})
+            for sport_id, sport_matches in matches.items()
+        })
+        init('empty_sport_payload', Payload({'matches': [], 'last_update': last_update, 'version': version}))
+        # The producer passes its parsed Matches; raw payloads are only re-parsed when there are none
+        if parsed is not None:
+            init('index', MatchIndex(match for sport_matches in parsed.values() for match in sport_matches))
+        else:
+            init('index', MatchIndex.from_raw(matches))
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("Snapshot is immutable, build a new one instead")
+
+    def sport_payload(self, sport_id: int) -> Payload:
+        return self.sport_payloads.get(sport_id, self.empty_sport_payload)
+
+EMPTY_SNAPSHOT = Snapshot({}, None)
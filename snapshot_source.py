@@ -0,0 +1,170 @@
+"""Structured live-match sources for sports_web.py
+
+The page reads the same snapshots the API serves instead of parsing the
+bot's log: the shared snapshot file, the local feed bus, or the API
+server's /matches. SPORTS_WEB_SOURCES lists which to try, in order.
+"""
+
+import os
+import time
+import requests
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Tuple
+from loguru import logger
+from feed_bus import read_latest
+from match_index import MatchIndex
+from match_model import Match
+from shared_snapshot import SharedSnapshotReader
+from sports_config import SUPPORTED_SPORTS
+
+SPORTS_BY_ID = {sport['id']: sport for sport in SUPPORTED_SPORTS.values()}
+
+# Seconds between checks of a source; the shared file is only a stat() away
+POLL_INTERVAL = float(os.getenv('SPORTS_WEB_POLL_INTERVAL', '5'))
+
+# (league, matches) per sport, in sport id order
+LeagueGroups = List[Tuple[str, List[Match]]]
+SportGroups = List[Tuple[Dict[str, Any], LeagueGroups]]
+
+def group_matches(index: MatchIndex) -> SportGroups:
+    """Live matches grouped by sport, then by league, from the snapshot's indexes
+
+    Within a league, matches are listed latest minute first, as the bot
+    logs them.
+    """
+    groups = []
+    for sport_id in sorted(index.by_sport):
+        sport = SPORTS_BY_ID.get(sport_id, {'id': sport_id, 'name': f"Sport {sport_id}", 'emoji': '🎮'})
+        leagues: Dict[str, List[Match]] = {}
+        for position in index.by_sport[sport_id]:
+            match = index.matches[position]
+            leagues.setdefault(match.league, []).append(match)
+        for matches in leagues.values():
+            matches.sort(key=lambda match: match.minute, reverse=True)
+        groups.append((sport, sorted(leagues.items())))
+    return groups
+
+def format_groups(groups: SportGroups) -> str:
+    """Plain-text listing, formatted like the bot's log output"""
+    lines = []
+    for sport, leagues in groups:
+        total = sum(len(matches) for _, matches in leagues)
+        lines.append(f"📱 Live {sport['name']} Matches ({total} total)")
+        for league, matches in leagues:
+            for match in matches:
+                lines.append(f"{league}\n{sport['emoji']} {match.home} {match.score or 'vs'} {match.away}\n"
+                             f"⏰ {match.minute}' ({match.period})")
+    return '\n'.join(lines)
+
+class LiveView:
+    """One snapshot as the page shows it, built once per version"""
+    __slots__ = ('source', 'version', 'last_update', 'groups', 'total')
+
+    def __init__(self, source: str, version: int, last_update: Optional[datetime], index: MatchIndex):
+        self.source = source
+        self.version = version
+        self.last_update = last_update
+        self.groups = group_matches(index)
+        self.total = len(index)
+
+    def text(self) -> str:
+        return format_groups(self.groups)
+
+class SnapshotSource(ABC):
+    """Checks one source at most every interval seconds and keeps its latest view"""
+    name = 'source'
+
+    def __init__(self, interval: float = POLL_INTERVAL):
+        self.interval = interval
+        self.view: Optional[LiveView] = None
+        self._checked = 0.0
+
+    @abstractmethod
+    def _load(self) -> Optional[LiveView]:
+        """A new view, or None if nothing changed since the last one"""
+
+    def current(self) -> Optional[LiveView]:
+        now = time.monotonic()
+        if self.view is None or now - self._checked >= self.interval:
+            self._checked = now
+            try:
+                self.view = self._load() or self.view
+            except Exception as e:
+                logger.error(f"❌ Error reading {self.name} snapshot: {str(e)}")
+        return self.view
+
+class SharedFileSource(SnapshotSource):
+    """The memory-mapped file written by sports_monitor_bot.py"""
+    name = 'shared'
+
+    def __init__(self, path: Optional[str] = None, interval: float = 1.0):
+        super().__init__(interval)
+        self.reader = SharedSnapshotReader(path)
+
+    def _load(self) -> Optional[LiveView]:
+        snapshot = self.reader.load()
+        if snapshot is None or (self.view is not None and self.view.version == snapshot.version):
+            return None
+        return LiveView(self.name, snapshot.version, snapshot.last_update, snapshot.index)
+
+class FeedSource(SnapshotSource):
+    """The latest cycle from the local feed bus"""
+    name = 'feed'
+
+    def __init__(self, path: Optional[str] = None, interval: float = POLL_INTERVAL):
+        super().__init__(interval)
+        self.path = path
+
+    def _load(self) -> Optional[LiveView]:
+        message = read_latest(self.path)
+        if message is None:
+            return None
+        last_update = datetime.fromisoformat(message['timestamp'])
+        if self.view is not None and (self.view.version, self.view.last_update) == (message['version'], last_update):
+            return None
+        return LiveView(self.name, message['version'], last_update, MatchIndex.from_raw(message['matches']))
+
+class ApiSource(SnapshotSource):
+    """The API server's /matches, revalidated with its ETag"""
+    name = 'api'
+
+    def __init__(self, url: Optional[str] = None, interval: float = POLL_INTERVAL, timeout: float = 5.0):
+        super().__init__(interval)
+        self.url = (url or os.getenv('SPORTS_API_URL', 'http://localhost:8000')).rstrip('/') + '/matches'
+        self.timeout = timeout
+        self.session = requests.Session()
+        self._etag: Optional[str] = None
+
+    def _load(self) -> Optional[LiveView]:
+        headers = {'If-None-Match': self._etag} if self._etag and self.view is not None else {}
+        response = self.session.get(self.url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        data = response.json()
+        self._etag = response.headers.get('ETag')
+        last_update = datetime.fromisoformat(data['last_update']) if data.get('last_update') else None
+        matches = {int(sport_id): matches for sport_id, matches in data.get('matches', {}).items()}
+        return LiveView(self.name, data.get('version', 0), last_update, MatchIndex.from_raw(matches))
+
+SOURCES = {'shared': SharedFileSource, 'feed': FeedSource, 'api': ApiSource}
+
+class LiveMatches:
+    """First source in order that has a snapshot"""
+
+    def __init__(self, names: Optional[str] = None):
+        self.sources: List[SnapshotSource] = []
+        for name in (names or os.getenv('SPORTS_WEB_SOURCES', 'shared,feed,api')).split(','):
+            name = name.strip()
+            if name in SOURCES:
+                self.sources.append(SOURCES[name]())
+            elif name:
+                logger.warning(f"⚠️ Unknown snapshot source: {name}")
+
+    def current(self) -> Optional[LiveView]:
+        for source in self.sources:
+            view = source.current()
+            if view is not None:
+                return view
+        return None
@@ -1,19 +1,19 @@
 SUPPORTED_SPORTS = {
-    'soccer': {'id': 1, 'name': 'Soccer'},
-    'basketball': {'id': 18, 'name': 'Basketball'},
-    'tennis': {'id': 13, 'name': 'Tennis'},
-    'volleyball': {'id': 91, 'name': 'Volleyball'},
-    'handball': {'id': 78, 'name': 'Handball'},
-    'baseball': {'id': 16, 'name': 'Baseball'},
-    'ice_hockey': {'id': 17, 'name': 'Ice Hockey'},
-    'american_football': {'id': 12, 'name': 'American Football'},
-    'snooker': {'id': 14, 'name': 'Snooker'},
-    'darts': {'id': 15, 'name': 'Darts'},
-    'table_tennis': {'id': 92, 'name': 'Table Tennis'},
-    'badminton': {'id': 94, 'name': 'Badminton'},
-    'rugby_league': {'id': 19, 'name': 'Rugby League'},
-    'australian_rules': {'id': 36, 'name': 'Australian Rules'},
-    'beach_volleyball': {'id': 95, 'name': 'Beach Volleyball'}
+    'soccer': {'id': 1, 'name': 'Soccer', 'emoji': '⚽'},
+    'basketball': {'id': 18, 'name': 'Basketball', 'emoji': '🏀'},
+    'tennis': {'id': 13, 'name': 'Tennis', 'emoji': '🎾'},
+    'volleyball': {'id': 91, 'name': 'Volleyball', 'emoji': '🏐'},
+    'handball': {'id': 78, 'name': 'Handball', 'emoji': '🤾'},
+    'baseball': {'id': 16, 'name': 'Baseball', 'emoji': '⚾'},
+    'ice_hockey': {'id': 17, 'name': 'Ice Hockey', 'emoji': '🏒'},
+    'american_football': {'id': 12, 'name': 'American Football', 'emoji': '🏈'},
+    'snooker': {'id': 14, 'name': 'Snooker', 'emoji': '🎱'},
+    'darts': {'id': 15, 'name': 'Darts', 'emoji': '🎯'},
+    'table_tennis': {'id': 92, 'name': 'Table Tennis', 'emoji': '🏓'},
+    'badminton': {'id': 94, 'name': 'Badminton', 'emoji': '🏸'},
+    'rugby_league': {'id': 19, 'name': 'Rugby League', 'emoji': '🏉'},
+    'australian_rules': {'id': 36, 'name': 'Australian Rules', 'emoji': '🏉'},
+    'beach_volleyball': {'id': 95, 'name': 'Beach Volleyball', 'emoji': '🏐'}
 }
 
 # API Endpoints
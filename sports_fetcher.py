@@ -0,0 +1,201 @@
+import os
+import math
+import time
+import asyncio
+from typing import Dict, List, Any, Iterable, Optional
+import aiohttp
+from loguru import logger
+from request_scheduler import RequestScheduler, PRIORITY_LIVE, get_scheduler
+from metrics import UPSTREAM_LATENCY, UPSTREAM_RESPONSES, QUOTA_REMAINING
+
+INPLAY_PATH = "/v3/events/inplay"
+
+FETCH_MODES = ('bulk', 'per_sport')
+
+# Seconds before bulk mode is probed again after the upstream rejected it
+BULK_REPROBE_SECONDS = float(os.getenv('SPORTS_BULK_REPROBE_SECONDS', '3600'))
+
+def rejects_bulk(page: Dict[str, Any]) -> bool:
+    """Whether a failed listing says sport_id is required, rather than failing transiently"""
+    error = f"{page.get('error', '')} {page.get('error_detail', '')}".lower()
+    return 'sport_id' in error or 'param_required' in error
+
+class SportsFetcher:
+    """Async in-play fetcher backed by a pooled keep-alive aiohttp session"""
+
+    def __init__(self, api_key: Optional[str] = None, api_host: Optional[str] = None,
+                 concurrency: Optional[int] = None, timeout: Optional[float] = None,
+                 mode: Optional[str] = None, scheduler: Optional[RequestScheduler] = None,
+                 priority: int = PRIORITY_LIVE):
+        self.api_key = api_key or os.getenv('SPORTS_API_KEY')
+        self.api_host = api_host or os.getenv('SPORTS_API_HOST')
+        self.concurrency = concurrency or int(os.getenv('SPORTS_FETCH_CONCURRENCY', '5'))
+        self.timeout = aiohttp.ClientTimeout(total=timeout or float(os.getenv('SPORTS_FETCH_TIMEOUT', '10')))
+        self.mode = mode or os.getenv('SPORTS_FETCH_MODE', 'bulk')
+        if self.mode not in FETCH_MODES:
+            raise ValueError(f"Unknown fetch mode {self.mode!r}, expected one of {FETCH_MODES}")
+        # Set when the upstream rejects the sport-less form; bulk is probed again afterwards
+        self._bulk_disabled_until = 0.0
+        self.scheduler = scheduler or get_scheduler()
+        # Quota priority of every call; secondary pollers pass PRIORITY_UPCOMING
+        self.priority = priority
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    @property
+    def bulk_supported(self) -> bool:
+        return time.monotonic() >= self._bulk_disabled_until
+
+    def _disable_bulk(self, reason: str):
+        self._bulk_disabled_until = time.monotonic() + BULK_REPROBE_SECONDS
+        logger.warning(f"⚠️ Bulk in-play request not supported upstream ({reason}), "
+                       f"using per-sport calls for {BULK_REPROBE_SECONDS:.0f}s")
+
+    @property
+    def inplay_url(self) -> str:
+        return f"https://{self.api_host}{INPLAY_PATH}"
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Create the shared session lazily so it binds to the running loop"""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.concurrency,
+                keepalive_timeout=60,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(connector=connector, timeout=self.timeout)
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._session
+
+    async def close(self):
+        """Close the pooled session"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def _get_json(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """GET the in-play endpoint, returning the decoded payload or None on failure"""
+        session = self._get_session()
+        await self.scheduler.acquire(self.priority)
+        async with self._semaphore:
+            # Latency is measured from here, after any quota or concurrency wait
+            started = time.perf_counter()
+            try:
+                async with session.get(self.inplay_url, params={'token': self.api_key, **params}) as response:
+                    await self.scheduler.observe_response(response.status, response.headers)
+                    UPSTREAM_RESPONSES.inc(response.status)
+                    QUOTA_REMAINING.set(self.scheduler.remaining())
+                    if response.status != 200:
+                        logger.error(f"❌ Error: {response.status}")
+                        return None
+                    return await response.json(content_type=None)
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                UPSTREAM_RESPONSES.inc('error')
+                raise
+            finally:
+                UPSTREAM_LATENCY.observe(time.perf_counter() - started, params.get('sport_id', 'all'))
+
+    async def fetch_sport(self, sport_id: int) -> Optional[List[Dict[str, Any]]]:
+        """Fetch in-play events for one sport, or None if the call failed
+
+        Every event is stamped with the integer sport_id it was fetched for,
+        as per-sport results do not reliably carry one.
+        """
+        data = await self._get_json({'sport_id': sport_id})
+        if data is None:
+            return None
+        if data.get('success') != 1:
+            logger.error(f"❌ API returned success = 0 for {sport_id}")
+            return None
+        results = data.get('results', [])
+        for match in results:
+            match['sport_id'] = sport_id
+        return results
+
+    async def fetch_all(self, sport_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """Fetch in-play events for every sport concurrently, keyed by sport_id
+
+        Sports whose request failed are left out of the result map.
+        """
+        sport_ids = list(sport_ids)
+        results = await asyncio.gather(
+            *(self.fetch_sport(sport_id) for sport_id in sport_ids),
+            return_exceptions=True
+        )
+
+        matches_by_sport = {}
+        for sport_id, result in zip(sport_ids, results):
+            if isinstance(result, BaseException):
+                logger.error(f"❌ Error fetching sport {sport_id}: {str(result)}")
+            elif result is not None:
+                matches_by_sport[sport_id] = result
+        return matches_by_sport
+
+    async def fetch_bulk(self, sport_ids: Iterable[int]) -> Optional[Dict[int, List[Dict[str, Any]]]]:
+        """Fetch in-play events for all sports in one paged listing and split by sport_id
+
+        Returns None if the listing could not be fetched. If the upstream
+        rejects the sport-less form, or its events carry no sport_id to split
+        on, bulk mode is switched off for BULK_REPROBE_SECONDS; transient
+        failures only skip it for this call.
+        """
+        pages = [await self._get_json({})]
+        if pages[0] is not None and pages[0].get('success') == 1:
+            pager = pages[0].get('pager') or {}
+            per_page = int(pager.get('per_page') or 0)
+            total = int(pager.get('total') or 0)
+            if per_page and total > per_page:
+                pages.extend(await asyncio.gather(
+                    *(self._get_json({'page': page}) for page in range(2, math.ceil(total / per_page) + 1))
+                ))
+        if any(page is None for page in pages):
+            return None
+
+        matches_by_sport = {sport_id: [] for sport_id in sport_ids}
+        for page in pages:
+            if page.get('success') != 1:
+                if rejects_bulk(page):
+                    self._disable_bulk(str(page.get('error') or 'success = 0'))
+                else:
+                    logger.error(f"❌ Bulk in-play listing failed: {page.get('error') or 'success = 0'}")
+                return None
+            for match in page.get('results', []):
+                sport_id = match.get('sport_id')
+                if sport_id is None:
+                    self._disable_bulk('events carry no sport_id')
+                    return None
+                try:
+                    sport_id = int(sport_id)
+                except (TypeError, ValueError):
+                    logger.warning(f"⚠️ Skipping in-play event with sport_id {sport_id!r}")
+                    continue
+                sport_matches = matches_by_sport.get(sport_id)
+                if sport_matches is not None:
+                    match['sport_id'] = sport_id
+                    sport_matches.append(match)
+        return matches_by_sport
+
+    @property
+    def uses_bulk(self) -> bool:
+        """Whether the next fetch_live will try one listing for every sport"""
+        return self.mode == 'bulk' and self.bulk_supported
+
+    async def fetch_live(self, sport_ids: Iterable[int],
+                         fallback_ids: Optional[Iterable[int]] = None) -> Dict[int, List[Dict[str, Any]]]:
+        """Fetch in-play events keyed by sport_id using the configured mode
+
+        Bulk mode falls back to per-sport calls when the listing fails, and
+        pauses while the upstream turns out not to support it. The fallback
+        only fetches fallback_ids (default: all of sport_ids), so a caller
+        can list every sport in bulk but retry just the ones it needs.
+        """
+        sport_ids = list(sport_ids)
+        if self.uses_bulk:
+            try:
+                matches_by_sport = await self.fetch_bulk(sport_ids)
+            except Exception as e:
+                logger.error(f"❌ Error fetching bulk in-play events: {str(e)}")
+                matches_by_sport = None
+            if matches_by_sport is not None:
+                return matches_by_sport
+        return await self.fetch_all(sport_ids if fallback_ids is None else fallback_ids)
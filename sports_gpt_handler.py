@@ -3,6 +3,7 @@ from openai import OpenAI
 from loguru import logger
 import yaml
 from typing import Dict, List, Any
+from match_model import Match
 
 class SportsGPTHandler:
     def __init__(self):
@@ -18,13 +19,13 @@ class SportsGPTHandler:
         with open('prompts.yaml', 'r') as file:
             self.prompts = yaml.safe_load(file)
 
-    async def analyze_match_data(self, match_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def analyze_match_data(self, match: Match) -> Dict[str, Any]:
         """Use GPT to analyze match data and provide insights"""
         prompt = self.prompts['match_analysis'].format(
-            home_team=match_data.get('home', {}).get('name', 'Unknown'),
-            away_team=match_data.get('away', {}).get('name', 'Unknown'),
-            score=match_data.get('ss', 'No score'),
-            time=match_data.get('time', 'No time')
+            home_team=match.home,
+            away_team=match.away,
+            score=match.score or 'No score',
+            time=match.raw.get('time', 'No time')
         )
 
         try:
@@ -41,21 +42,21 @@ class SportsGPTHandler:
             analysis = response.choices[0].message.content
             return {
                 'analysis': analysis,
-                'match_id': match_data.get('id'),
-                'timestamp': match_data.get('time')
+                'match_id': match.id,
+                'timestamp': match.raw.get('time')
             }
         except Exception as e:
             logger.error(f"Error in GPT analysis: {str(e)}")
             return None
 
-    async def suggest_api_queries(self, current_matches: List[Dict[str, Any]]) -> List[str]:
+    async def suggest_api_queries(self, current_matches: List[Match]) -> List[str]:
         """Generate API query suggestions based on current matches"""
         if not current_matches:
             return []
 
         # Format match information for GPT
         match_info = "\n".join([
-            f"{m.get('home', {}).get('name', 'Unknown')} vs {m.get('away', {}).get('name', 'Unknown')} ({m.get('league', {}).get('name', 'Unknown League')})"
+            f"{m.home} vs {m.away} ({m.league})"
             for m in current_matches[:5]  # Limit to 5 matches to avoid token limits
         ])
 
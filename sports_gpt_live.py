@@ -4,8 +4,11 @@ from openai import OpenAI
 from loguru import logger
 import yaml
 from typing import Dict, List, Any
-import requests
 from dotenv import load_dotenv
+from request_scheduler import get_scheduler
+from match_diff import SnapshotDiffer
+from live_matches import LiveMatchClient
+from match_model import Match
 
 # Load environment variables
 load_dotenv()
@@ -20,6 +23,12 @@ class SportsGPTLive:
         # Load sports-specific prompts
         self.load_prompts()
         
+        # Tracks which matches changed since the last cycle
+        self.differ = SnapshotDiffer()
+        
+        # Live matches from the feed bus, or low-priority API calls without a producer
+        self.live_matches = LiveMatchClient()
+        
         # Initialize sport IDs
         self.sports = {
             'soccer': 1,
@@ -34,35 +43,22 @@ class SportsGPTLive:
         with open('prompts.yaml', 'r') as file:
             self.prompts = yaml.safe_load(file)
 
-    async def get_live_matches(self, sport_id: int) -> List[Dict[str, Any]]:
-        """Fetch live matches for a specific sport"""
-        url = f"{self.base_url}/v3/events/inplay"
-        params = {
-            'token': self.api_key,
-            'sport_id': sport_id
-        }
-        
-        try:
-            response = requests.get(url, params=params)
-            if response.status_code == 200:
-                return response.json().get('results', [])
-            return []
-        except Exception as e:
-            logger.error(f"Error fetching live matches: {str(e)}")
-            return []
+    async def get_live_matches(self, sport_id: int) -> List[Match]:
+        """Fetch live matches for a specific sport, from the local feed bus when a producer is running"""
+        return await self.live_matches.matches(sport_id) or []
 
-    async def analyze_live_match(self, match_data: Dict[str, Any], sport: str) -> Dict[str, Any]:
+    async def analyze_live_match(self, match: Match, sport: str) -> Dict[str, Any]:
         """Analyze a live match using GPT"""
         # Create a sport-specific analysis prompt
         if sport == 'tennis':
             prompt = f"""
             Analyze this live tennis match:
-            {match_data.get('home', {}).get('name')} vs {match_data.get('away', {}).get('name')}
-            Score: {match_data.get('ss', 'No score')}
-            Tournament: {match_data.get('league', {}).get('name')}
+            {match.home} vs {match.away}
+            Score: {match.score or 'No score'}
+            Tournament: {match.league}
             
-            Detailed scores: {match_data.get('scores', {})}
-            Statistics: {match_data.get('stats', {})}
+            Detailed scores: {match.raw.get('scores', {})}
+            Statistics: {match.raw.get('stats', {})}
             
             Provide insights about:
             1. Current match state and momentum
@@ -73,11 +69,11 @@ class SportsGPTLive:
         else:  # Default format for other sports
             prompt = f"""
             Analyze this live {sport} match:
-            {match_data.get('home', {}).get('name')} vs {match_data.get('away', {}).get('name')}
-            Score: {match_data.get('ss', 'No score')}
-            League: {match_data.get('league', {}).get('name')}
+            {match.home} vs {match.away}
+            Score: {match.score or 'No score'}
+            League: {match.league}
             
-            Statistics: {match_data.get('stats', {})}
+            Statistics: {match.raw.get('stats', {})}
             
             Provide insights about:
             1. Current match state
@@ -89,10 +85,10 @@ class SportsGPTLive:
         try:
             response = await self.get_gpt_analysis(prompt)
             return {
-                'match_id': match_data.get('id'),
+                'match_id': match.id,
                 'sport': sport,
                 'analysis': response,
-                'timestamp': match_data.get('time')
+                'timestamp': match.raw.get('time')
             }
         except Exception as e:
             logger.error(f"Error in match analysis: {str(e)}")
@@ -129,20 +125,21 @@ class SportsGPTLive:
 
                 logger.info(f"Found {len(matches)} live {sport_name} matches")
                 
-                # Analyze each match
-                for match in matches[:3]:  # Limit to 3 matches per sport to avoid API overload
+                # Analyze new or re-scored matches only
+                changes = self.differ.diff({sport_id: matches})
+                for match in changes.changed_matches()[:3]:  # Limit to 3 matches per sport to avoid API overload
                     analysis = await self.analyze_live_match(match, sport_name)
                     if analysis:
                         print(f"\n{'='*50}")
                         print(f"Sport: {sport_name.upper()}")
-                        print(f"Match: {match.get('home', {}).get('name')} vs {match.get('away', {}).get('name')}")
-                        print(f"Score: {match.get('ss', 'No score')}")
+                        print(f"Match: {match.home} vs {match.away}")
+                        print(f"Score: {match.score or 'No score'}")
                         print(f"\nAnalysis:")
                         print(analysis['analysis'])
                         print(f"{'='*50}\n")
 
             # Wait before next update
-            await asyncio.sleep(300)  # 5 minutes delay
+            await asyncio.sleep(get_scheduler().recommended_interval(300))  # 5 minutes delay
 
 async def main():
     gpt_live = SportsGPTLive()
@@ -1,9 +1,23 @@
 import os
-import requests
+import time
 import asyncio
+from datetime import datetime
 from dotenv import load_dotenv
 from loguru import logger
 import sys
+from sports_fetcher import SportsFetcher
+from request_scheduler import get_scheduler
+from poll_cadence import AdaptivePollScheduler
+from match_diff import SnapshotDiffer, Changeset
+from feed_bus import FeedPublisher, FeedSubscriber
+from match_model import Match
+from esport_classifier import get_classifier
+from period_resolver import get_resolver
+from match_store import MatchStore
+from snapshot import Snapshot
+from shared_snapshot import SharedSnapshotWriter
+from match_log import MatchLogWriter
+from metrics import PIPELINE, LIVE_MATCHES, ESPORT_FILTERED, CYCLE_SECONDS
 
 # Load environment variables
 load_dotenv()
@@ -38,122 +52,193 @@ SPORTS = {
     95: {'name': 'Beach Volleyball', 'emoji': '🏐'}
 }
 
+def serialize_matches(matches_by_sport):
+    """Raw API payloads keyed by sport_id, for JSON output"""
+    return {sport_id: [match.to_dict() for match in matches] for sport_id, matches in matches_by_sport.items()}
+
 class SportsMonitorBot:
     def __init__(self):
         self.api_key = os.getenv('SPORTS_API_KEY')
         self.api_host = os.getenv('SPORTS_API_HOST')
+        self.fetcher = SportsFetcher(self.api_key, self.api_host)
+        self.esport_classifier = get_classifier()
+        self.period_resolver = get_resolver()
+        self.cadence = AdaptivePollScheduler(SPORTS.keys())
+        self.live_matches = {}
+        self.differ = SnapshotDiffer()
+        self.last_changes = Changeset([], 0)
+        # Opened by open_store() in the producer only; followers never diff upstream data
+        self.store = None
 
-    def is_esport(self, league_name):
+    def is_esport(self, league_name, league_id=None):
         """Check if the league is an e-sport league"""
-        esport_keywords = ['esoccer', 'esports', 'e-', 'cyber', 'ebasketball', 'etennis', 'evolleyball', 'ehockey']
-        league_name = league_name.lower()
-        return any(keyword in league_name for keyword in esport_keywords)
+        return self.esport_classifier.is_esport(league_name, league_id)
 
     def get_period(self, match, sport_id):
         """Get the current period of the match"""
-        time_status = match.get('time_status')
-        timer = match.get('timer', {})
-        time = timer.get('tm', '0')
-        
-        if time_status == '1':  # Match is live
-            if sport_id == 1:  # Soccer
-                if int(time) <= 45:
-                    return '1H'
-                else:
-                    return '2H'
-            elif sport_id == 18:  # Basketball
-                quarter = match.get('timer', {}).get('q', '1')
-                return f'Q{quarter}'
-            elif sport_id == 13:  # Tennis
-                # Get the current score which includes set information
-                score = match.get('ss', '')
-                if score:
-                    # Count the number of completed sets by counting commas
-                    completed_sets = score.count(',')
-                    # Current set is the number of completed sets + 1
-                    current_set = completed_sets + 1
-                    return f'Set {current_set}'
-            elif sport_id == 91:  # Volleyball
-                set_info = match.get('timer', {}).get('set', '1')
-                return f'Set {set_info}'
-            elif sport_id == 17:  # Ice Hockey
-                period = match.get('timer', {}).get('p', '1')
-                return f'P{period}'
-            elif sport_id == 14:  # Snooker
-                frame = match.get('timer', {}).get('f', '1')
-                return f'Frame {frame}'
-            elif sport_id == 78:  # Handball
-                half = int(time) <= 30 and '1H' or '2H'
-                return half
-            elif sport_id == 15:  # Darts
-                set_info = match.get('timer', {}).get('set', '1')
-                leg = match.get('timer', {}).get('leg', '1')
-                return f'Set {set_info} Leg {leg}'
-            elif sport_id == 92:  # Table Tennis
-                game = match.get('timer', {}).get('game', '1')
-                return f'Game {game}'
-        return '-'
-
-    def format_match(self, match, sport_id):
+        return self.period_resolver.resolve(match, sport_id)
+
+    def build_match(self, raw, sport_id, period, is_esport):
+        """Parse one raw in-play result into a Match"""
+        return Match.from_api(raw, sport_id, period=period, is_esport=is_esport)
+
+    def format_match(self, match):
         """Format match with minimal essential information"""
-        league = match.get('league', {}).get('name', 'Unknown League')
-        home = match.get('home', {}).get('name', 'Unknown')
-        away = match.get('away', {}).get('name', 'Unknown')
-        score = match.get('ss', 'vs')
-        timer = match.get('timer', {})
-        time = timer.get('tm', '0')
-        period = self.get_period(match, sport_id)
-        
-        sport_info = SPORTS.get(sport_id, {'emoji': '🎮'})
-        return f"{league}\n{sport_info['emoji']} {home} {score} {away}\n⏰ {time}' ({period})\n"
+        sport_info = SPORTS.get(match.sport_id, {'emoji': '🎮'})
+        return f"{match.league}\n{sport_info['emoji']} {match.home} {match.score or 'vs'} {match.away}\n⏰ {match.minute}' ({match.period})\n"
 
-    async def fetch_live_matches(self):
-        """Fetch live matches from the API for all sports"""
-        url = f"https://{self.api_host}/v3/events/inplay"
-        all_matches = []
+    async def fetch_live_matches(self, sport_ids=None):
+        """Fetch live matches for the given sports (all by default), keyed by sport_id
+
+        In bulk mode one listing returns every sport, so every sport is
+        recorded and the given ones only decide when the listing is made;
+        per-sport cadences apply to per_sport mode. Sports that were not
+        fetched this time keep their previous matches. The diff against the
+        previous snapshot is kept in last_changes, and only sports with
+        changes are re-logged.
+        """
+        due = list(SPORTS.keys() if sport_ids is None else sport_ids)
+        if self.fetcher.uses_bulk:
+            results = await self.fetcher.fetch_live(SPORTS.keys(), fallback_ids=due)
+        else:
+            results = await self.fetcher.fetch_live(due)
+        for sport_id in due:
+            if results.get(sport_id) is None:
+                self.cadence.record_failure(sport_id)
+        fetched = {}
         
-        for sport_id, sport_info in SPORTS.items():
-            try:
-                params = {
-                    'token': self.api_key,
-                    'sport_id': sport_id
-                }
-                
-                response = requests.get(url, params=params)
-                if response.status_code == 200:
-                    data = response.json()
-                    if data.get('success') == 1:
-                        matches = data.get('results', [])
-                        # Filter out e-sports matches
-                        real_matches = [m for m in matches if not self.is_esport(m.get('league', {}).get('name', ''))]
-                        
-                        if real_matches:
-                            logger.info(f"\n📱 Live {sport_info['name']} Matches ({len(real_matches)} total)\n")
-                            
-                            # Sort matches by time (descending)
-                            real_matches.sort(key=lambda x: int(x.get('timer', {}).get('tm', 0)), reverse=True)
-                            
-                            for match in real_matches:
-                                logger.info(self.format_match(match, sport_id))
-                            
-                            all_matches.extend(real_matches)
-                            # Pause between sports to make it easier to read
-                            await asyncio.sleep(2)
-                    else:
-                        logger.error(f"❌ API returned success = 0 for {sport_id}")
-                else:
-                    logger.error(f"❌ Error: {response.status_code}")
-                    
-            except Exception as e:
-                logger.error(f"❌ Error fetching {sport_info['name']} matches: {str(e)}")
+        for sport_id, matches in results.items():
+            if sport_id not in SPORTS:
+                continue
+            
+            # Classify the whole result list in one pass, then parse only the real matches
+            real_raws, esport_raws = self.esport_classifier.split(matches)
+            ESPORT_FILTERED.inc(sport_id, amount=len(esport_raws))
+            periods = self.period_resolver.resolve_many(real_raws, sport_id)
+            real_matches = [self.build_match(raw, sport_id, period, False) for raw, period in zip(real_raws, periods)]
+            self.cadence.record(sport_id, real_matches)
+            LIVE_MATCHES.set(len(real_matches), sport_id)
+            fetched[sport_id] = real_matches
+        
+        self.last_changes = self.differ.diff(fetched)
+        if self.store is not None:
+            self.store.record(self.last_changes)
+        changed_sports = set(self.last_changes.sport_ids)
+        
+        for sport_id, real_matches in fetched.items():
+            if not real_matches:
+                self.live_matches.pop(sport_id, None)
+                continue
+            
+            # Sort matches by time (descending)
+            real_matches.sort(key=lambda m: m.minute, reverse=True)
+            self.live_matches[sport_id] = real_matches
+            
+            if sport_id in changed_sports:
+                # One record per sport, so loguru's queue sees one message instead of one per match
+                logger.info(f"\n📱 Live {SPORTS[sport_id]['name']} Matches ({len(real_matches)} total)\n\n"
+                            + '\n'.join(self.format_match(match) for match in real_matches))
                 
-        return all_matches
+        return dict(self.live_matches)
+
+    async def poll_due_sports(self):
+        """Fetch only the sports whose adaptive cadence is due
+
+        In bulk mode the one listing therefore runs at the shortest interval
+        of any sport. Returns the merged live matches and the seconds to
+        wait before the next poll, stretched when the API budget runs low.
+        """
+        due = self.cadence.due_sports()
+        if not due:
+            self.last_changes = Changeset([], 0)
+            return dict(self.live_matches), max(1.0, self.cadence.seconds_until_due())
+        started = time.perf_counter()
+        matches_by_sport = await self.fetch_live_matches(due)
+        CYCLE_SECONDS.observe(time.perf_counter() - started)
+        wait = get_scheduler().recommended_interval(max(1.0, self.cadence.seconds_until_due()))
+        return matches_by_sport, wait
+
+    def feed_meta(self):
+        """Producer-side details published alongside every cycle"""
+        return {
+            'cadence': self.cadence.describe(),
+            'quota_remaining': get_scheduler().remaining(),
+            'metrics': PIPELINE.render()
+        }
+
+    async def publish(self, feed, matches_by_sport):
+        """Publish this cycle to the local feed bus if anything changed"""
+        if self.last_changes or feed.latest is None:
+            await feed.publish(serialize_matches(matches_by_sport), self.last_changes.to_dict(), **self.feed_meta())
+
+    async def publish_shared(self, writer, feed, matches_by_sport):
+        """Write this cycle to the shared snapshot file if anything changed
+
+        Called before publish() and stamped with the version the feed bus is
+        about to use, so workers notified by the feed always find it mapped.
+        """
+        if self.last_changes or writer.version == 0:
+            snapshot = await asyncio.to_thread(
+                Snapshot, serialize_matches(matches_by_sport), datetime.now(), feed.version + 1, self.feed_meta(),
+                matches_by_sport
+            )
+            await asyncio.to_thread(writer.write, snapshot)
+
+    def open_store(self):
+        """Start recording match history; only the process that polls the API does this"""
+        if self.store is None:
+            self.store = MatchStore()
+
+    def close_store(self):
+        """Flush and close the match history store, waiting for its writer thread"""
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+    def log_feed_cycle(self, message):
+        """Log a cycle published by another feed producer"""
+        changes = message.get('changes') or {}
+        counts = ', '.join(f"{len(changes.get(kind) or [])} {kind}"
+                           for kind in ('added', 'removed', 'score_changed', 'timer_changed'))
+        live = sum(len(matches) for matches in message.get('matches', {}).values())
+        logger.info(f"📡 Cycle {message.get('version')} from the feed producer: {live} live, {counts}")
+
+    async def write_match_log(self, match_log, matches_by_sport):
+        """Append this cycle to the structured match log if anything changed"""
+        if self.last_changes:
+            await asyncio.to_thread(match_log.write_cycle, matches_by_sport)
 
 async def run_monitoring():
     bot = SportsMonitorBot()
-    while True:
-        await bot.fetch_live_matches()
-        await asyncio.sleep(60)  # Wait for 60 seconds before next update
+    feed = FeedPublisher()
+    publishing = await feed.start()
+    if not publishing:
+        # Another producer already polls the API; follow it rather than spend the same quota twice
+        try:
+            async for message in FeedSubscriber().messages():
+                bot.log_feed_cycle(message)
+        finally:
+            await bot.fetcher.close()
+        return
+    bot.open_store()
+    # Multi-worker API servers (SPORTS_FEED_ROLE=shared) serve from this file
+    shared = SharedSnapshotWriter() if os.getenv('SPORTS_SHARED_SNAPSHOT') else None
+    match_log = MatchLogWriter.from_env()
+    try:
+        while True:
+            matches, wait = await bot.poll_due_sports()
+            if shared is not None:
+                await bot.publish_shared(shared, feed, matches)
+            await bot.publish(feed, matches)
+            if match_log is not None:
+                await bot.write_match_log(match_log, matches)
+            await asyncio.sleep(wait)
+    finally:
+        if match_log is not None:
+            match_log.close()
+        await feed.close()
+        await bot.fetcher.close()
+        bot.close_store()
 
 if __name__ == "__main__":
     logger.info("Starting Sports Monitor Bot...")
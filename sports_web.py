@@ -1,20 +1,14 @@
-from flask import Flask, render_template_string
+from flask import Flask, Response, request
 import os
+import hashlib
 from datetime import datetime
-import re
-from openai import OpenAI
-from fastapi import BackgroundTasks
 import logging
-from autogpt.agent import Agent
-from autogpt.config import Config
-from autogpt.workspace import Workspace
-from autogpt.commands.command import CommandRegistry
+import threading
+from typing import Any, Callable, Optional, Tuple
+from snapshot_source import LiveMatches, LiveView
 
 app = Flask(__name__)
 
-# Initialize OpenAI client
-client = OpenAI()
-
 # Initialize logger
 logger = logging.getLogger(__name__)
 
@@ -71,7 +65,18 @@ HTML_TEMPLATE = """
 <body>
     <h1>📱 Live Sports Monitor</h1>
     <div id="matches">
-        <pre>{{ matches | safe }}</pre>
+        {% for sport, leagues in groups %}
+        <div class="sport-header">{{ sport.emoji }} Live {{ sport.name }} Matches</div>
+        {% for league, matches in leagues %}
+        <div class="match">
+            <strong>{{ league }}</strong>
+            <pre>{% for match in matches %}{{ sport.emoji }} {{ match.home }} {{ match.score or 'vs' }} {{ match.away }}  ⏰ {{ match.minute }}' ({{ match.period }})
+{% endfor %}</pre>
+        </div>
+        {% endfor %}
+        {% else %}
+        <pre>{{ message }}</pre>
+        {% endfor %}
     </div>
     <div class="last-update">
         Last Update: {{ last_update }}
@@ -82,71 +87,42 @@ HTML_TEMPLATE = """
 </html>
 """
 
-def is_esport(league_name):
-    """Check if the league is an e-sport league"""
-    esport_keywords = ['esoccer', 'esports', 'e-', 'cyber', 'ebasketball', 'etennis', 'evolleyball', 'ehockey']
-    league_name = league_name.lower()
-    return any(keyword in league_name for keyword in esport_keywords)
+# Structured snapshots from the bot (shared file, feed bus or API server);
+# they are already free of e-sports, filtered by the bot's classifier
+live_matches = LiveMatches()
 
-def read_log_file():
-    """Read the latest matches from the log file"""
-    try:
-        # Get the absolute path to the log file
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        log_file = os.path.join(current_dir, 'sports_monitor.log')
-        
-        with open(log_file, 'r', encoding='utf-8') as f:
-            lines = f.readlines()
-            
-        # Get the latest complete update
-        matches = []
-        current_sport = None
-        current_sport_matches = []
-        
-        for line in reversed(lines):
-            # Split the log line to get the actual message
-            parts = line.split('|')
-            if len(parts) >= 2:
-                message = parts[-1].strip()
-                
-                # Check for start/end markers
-                if "Starting Sports Monitor Bot" in message:
-                    if current_sport and current_sport_matches:
-                        matches.extend([current_sport] + current_sport_matches)
-                    break
-                
-                # Check for sport header (e.g. "📱 Live Soccer Matches (5 total)")
-                if "Live" in message and "Matches" in message:
-                    if current_sport and current_sport_matches:
-                        matches.extend([current_sport] + current_sport_matches)
-                    current_sport = message
-                    current_sport_matches = []
-                    continue
-                
-                # Skip e-sports matches
-                if any(keyword in message.lower() for keyword in ['esoccer', 'esports', 'e-', 'cyber']):
-                    continue
-                    
-                # Only add lines that contain match data (must have both emoji and score)
-                if any(emoji in message for emoji in ['⚽', '🏀', '🎾', '🏐', '🏒', '🤾', '⚾', '🏈', '🎱', '🎯', '🏓', '🏸', '🏉']):
-                    if ('vs' in message or '-' in message) and '⏰' in message:
-                        current_sport_matches.append(message)
-        
-        # Add the last sport section if it exists
-        if current_sport and current_sport_matches:
-            matches.extend([current_sport] + current_sport_matches)
-        
-        if not matches:
-            return "No live matches available at the moment. Please wait for updates..."
-            
-        return '\n'.join(matches)
-    except Exception as e:
-        return f"Error reading match data: {str(e)}\nPlease make sure the sports monitor bot is running."
+NO_MATCHES = "No live matches available at the moment. Please wait for updates..."
+NO_SOURCE = "No match data available.\nPlease make sure the sports monitor bot is running."
+
+def read_matches():
+    """The latest live matches as text, for the analysis endpoints"""
+    view = live_matches.current()
+    if view is None:
+        return NO_SOURCE
+    return view.text() or NO_MATCHES
+
+# Compiled once; the rendered page is then reused until the data changes
+page_template = app.jinja_env.from_string(HTML_TEMPLATE)
+rendered_page: Tuple[Optional[LiveView], bytes, str] = (None, b'', '')
+
+def render_home() -> Tuple[bytes, str]:
+    """The page body and its ETag, re-rendered only when a new snapshot has landed"""
+    global rendered_page
+    view = live_matches.current()
+    if view is None or rendered_page[0] is not view:
+        last_update = view.last_update if view is not None and view.last_update else datetime.now()
+        body = page_template.render(
+            groups=view.groups if view is not None else [],
+            message=NO_SOURCE if view is None else NO_MATCHES,
+            last_update=last_update.strftime('%Y-%m-%d %H:%M:%S')
+        ).encode('utf-8')
+        rendered_page = (view, body, hashlib.blake2b(body, digest_size=16).hexdigest())
+    return rendered_page[1], rendered_page[2]
 
 async def analyze_sports_data(data):
     """Analyze sports data using OpenAI API - runs on Digital Ocean"""
     try:
-        response = await client.chat.completions.create(
+        response = await services.client.chat.completions.create(
             model="gpt-4",
             messages=[
                 {"role": "system", "content": "You are a sports analysis assistant that helps monitor matches and suggest UI improvements."},
@@ -160,8 +136,18 @@ async def analyze_sports_data(data):
         return None
 
 # AutoGPT Integration
+def init_openai():
+    """Initialize the OpenAI client"""
+    from openai import OpenAI
+    return OpenAI()
+
 def init_autogpt():
     """Initialize AutoGPT agent - runs on Digital Ocean"""
+    from autogpt.agent import Agent
+    from autogpt.config import Config
+    from autogpt.workspace import Workspace
+    from autogpt.commands.command import CommandRegistry
+
     config = Config()
     config.continuous_mode = True
     config.speak_mode = False
@@ -183,29 +169,71 @@ def init_autogpt():
     )
     return agent
 
-# Initialize AutoGPT agent
-agent = init_autogpt()
+class Services:
+    """OpenAI client and AutoGPT agent, imported and built on first use
+
+    The page never needs them, so startup is just Flask; only the analysis
+    endpoints pay for the AI stacks, once.
+    """
+
+    def __init__(self):
+        self._services = {}
+        self._locks = {'client': threading.Lock(), 'agent': threading.Lock()}
+
+    def _get(self, name: str, factory: Callable[[], Any]) -> Any:
+        service = self._services.get(name)
+        if service is None:
+            with self._locks[name]:
+                service = self._services.get(name)
+                if service is None:
+                    service = self._services[name] = factory()
+        return service
+
+    @property
+    def client(self):
+        return self._get('client', init_openai)
+
+    @property
+    def agent(self):
+        return self._get('agent', init_autogpt)
+
+    def prewarm(self):
+        """Build both services in the background so the first analysis is not slow"""
+        def warm():
+            for name in ('client', 'agent'):
+                try:
+                    getattr(self, name)
+                except Exception as e:
+                    logger.error(f"Error pre-warming {name}: {e}")
+        threading.Thread(target=warm, name='services-prewarm', daemon=True).start()
+
+services = Services()
+if os.getenv('SPORTS_WEB_PREWARM', '0') == '1':
+    services.prewarm()
 
 @app.route('/')
 def home():
-    matches = read_log_file()
-    last_update = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    return render_template_string(HTML_TEMPLATE, matches=matches, last_update=last_update)
+    body, etag = render_home()
+    # Browsers revalidate on every auto-refresh and get a 304 until the next cycle
+    response = Response(body, mimetype='text/html')
+    response.set_etag(etag)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
 
 @app.route('/analyze', methods=['POST'])
 async def analyze_matches():
     """Endpoint to analyze matches - runs entirely on Digital Ocean"""
-    matches = read_log_file()
+    matches = read_matches()
     analysis = await analyze_sports_data(matches)
     return {"status": "Analysis completed", "analysis": analysis}
 
 @app.route('/autogpt/analyze', methods=['POST'])
 def autogpt_analyze():
     """Use AutoGPT to analyze matches and suggest improvements"""
-    matches = read_log_file()
+    matches = read_matches()
     
     # Run AutoGPT analysis
-    result = agent.run_task(
+    result = services.agent.run_task(
         f"Analyze these sports matches and suggest UI improvements: {matches}"
     )
     
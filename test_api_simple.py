@@ -1,6 +1,7 @@
 import os
 import requests
 from dotenv import load_dotenv
+from esport_classifier import is_esport
 
 # Load environment variables
 load_dotenv()
@@ -17,12 +18,6 @@ SPORTS = {
     92: {'name': 'Table Tennis', 'emoji': '🏓'}
 }
 
-def is_esport(league_name):
-    """Check if the league is an e-sport league"""
-    esport_keywords = ['esoccer', 'esports', 'e-', 'cyber', 'ebasketball', 'etennis', 'evolleyball', 'ehockey']
-    league_name = league_name.lower()
-    return any(keyword in league_name for keyword in esport_keywords)
-
 def get_period(match, sport_id):
     """Get the current period of the match"""
     time_status = match.get('time_status')
@@ -0,0 +1,116 @@
+from change_history import ChangeHistory
+from match_diff import ADDED, REMOVED, SCORE_CHANGED, TIMER_CHANGED
+
+def change(kind, event_id, sport_id=1, score='0-0'):
+    return {'type': kind, 'sport_id': sport_id, 'id': event_id, 'score': score}
+
+def cycle(*changes):
+    grouped = {ADDED: [], REMOVED: [], SCORE_CHANGED: [], TIMER_CHANGED: []}
+    for entry in changes:
+        grouped[entry['type']].append(entry)
+    return grouped
+
+def ids(delta, kind):
+    return [entry['id'] for entry in delta[kind]]
+
+def test_since_current_version_is_empty():
+    history = ChangeHistory()
+    history.record(cycle(change(ADDED, 'a')))
+    assert history.since(1) == {ADDED: [], REMOVED: [], SCORE_CHANGED: [], TIMER_CHANGED: []}
+
+def test_since_merges_later_cycles_only():
+    history = ChangeHistory()
+    history.record(cycle(change(ADDED, 'a')))
+    history.record(cycle(change(ADDED, 'b')))
+    history.record(cycle(change(SCORE_CHANGED, 'a', score='1-0')))
+    delta = history.since(1)
+    assert ids(delta, ADDED) == ['b']
+    assert ids(delta, SCORE_CHANGED) == ['a']
+    assert delta[SCORE_CHANGED][0]['score'] == '1-0'
+
+def test_added_then_removed_cancels_out():
+    history = ChangeHistory()
+    history.record(cycle(change(ADDED, 'a')))
+    history.record(cycle(change(REMOVED, 'a')))
+    assert all(not entries for entries in history.since(0).values())
+
+def test_added_then_updated_stays_added_with_latest_state():
+    history = ChangeHistory()
+    history.record(cycle(change(ADDED, 'a')))
+    history.record(cycle(change(SCORE_CHANGED, 'a', score='2-1')))
+    delta = history.since(0)
+    assert ids(delta, ADDED) == ['a']
+    assert delta[ADDED][0] == {**change(SCORE_CHANGED, 'a', score='2-1'), 'type': ADDED}
+
+def test_score_change_wins_over_later_timer_change():
+    history = ChangeHistory()
+    history.record(cycle(change(SCORE_CHANGED, 'a', score='1-0')))
+    history.record(cycle(change(TIMER_CHANGED, 'a', score='1-0')))
+    delta = history.since(0)
+    assert ids(delta, SCORE_CHANGED) == ['a']
+    assert delta[TIMER_CHANGED] == []
+
+def test_same_event_id_in_two_sports_is_kept_apart():
+    history = ChangeHistory()
+    history.record(cycle(change(ADDED, 'a', sport_id=1), change(ADDED, 'a', sport_id=13)))
+    assert sorted(entry['sport_id'] for entry in history.since(0)[ADDED]) == [1, 13]
+
+def test_versions_outside_the_window_need_a_resync():
+    history = ChangeHistory(size=2)
+    for event_id in 'abc':
+        history.record(cycle(change(ADDED, event_id)))
+    assert history.since(0) is None
+    assert ids(history.since(1), ADDED) == ['b', 'c']
+    assert history.since(4) is None
+
+def test_versions_never_go_backwards():
+    history = ChangeHistory()
+    history.record(cycle(change(ADDED, 'a')), 10)
+    assert history.record(cycle(change(ADDED, 'b')), 3) == 11
+    assert history.record(cycle(change(ADDED, 'c'))) == 12
+
+def test_version_gap_drops_older_deltas():
+    history = ChangeHistory()
+    history.record(cycle(change(ADDED, 'a')), 1)
+    history.record(cycle(change(ADDED, 'b')), 5)
+    assert history.base == 5
+    assert history.since(1) is None
+    history.record(cycle(change(ADDED, 'c')), 6)
+    assert ids(history.since(5), ADDED) == ['c']
+
+def test_repeated_upstream_cycles_are_ignored():
+    history = ChangeHistory()
+    assert history.record_upstream(cycle(change(ADDED, 'a')), 'p1', 100) == 100
+    assert history.record_upstream(cycle(change(ADDED, 'b')), 'p1', 101) == 101
+    assert history.record_upstream(cycle(change(ADDED, 'b')), 'p1', 101) is None
+    assert history.record_upstream(cycle(), 'p1', 100) is None
+    assert history.version == 101
+    assert ids(history.since(100), ADDED) == ['b']
+
+def test_missed_upstream_cycle_needs_a_resync():
+    history = ChangeHistory()
+    history.record_upstream(cycle(change(ADDED, 'a')), 'p1', 100)
+    assert history.record_upstream(cycle(change(ADDED, 'c')), 'p1', 102) == 102
+    assert history.base == 102
+    assert history.since(100) is None
+
+def test_restarted_producer_keeps_local_versions_increasing():
+    history = ChangeHistory()
+    for version in range(41, 51):
+        history.record_upstream(cycle(change(ADDED, f"old{version}")), 'p1', version)
+    # The new producer numbers from 1 again
+    assert history.record_upstream(cycle(change(ADDED, 'new1')), 'p2', 1) == 51
+    assert history.base == 51
+    for version in range(2, 11):
+        assert history.record_upstream(cycle(change(ADDED, f"new{version}")), 'p2', version) == 50 + version
+    # A client holding the old producer's version 50 resyncs instead of getting new2..new10
+    assert history.since(50) is None
+    assert ids(history.since(51), ADDED) == [f"new{version}" for version in range(2, 11)]
+
+def test_missed_cycle_after_a_restart_is_still_detected():
+    history = ChangeHistory()
+    history.record_upstream(cycle(), 'p1', 50)
+    history.record_upstream(cycle(), 'p2', 1)
+    history.record_upstream(cycle(change(ADDED, 'x')), 'p2', 2)
+    assert history.record_upstream(cycle(change(ADDED, 'y')), 'p2', 5) == 53
+    assert history.base == 53
@@ -0,0 +1,66 @@
+import asyncio
+from feed_bus import FeedPublisher, FeedSubscriber, read_latest
+
+def run(coroutine):
+    return asyncio.run(asyncio.wait_for(coroutine, 10))
+
+def test_one_shot_readers_are_dropped_without_a_publish(tmp_path):
+    path = str(tmp_path / 'feed.sock')
+
+    async def scenario():
+        publisher = FeedPublisher(path)
+        assert await publisher.start()
+        await publisher.publish({1: [{'id': 'a'}]}, {})
+        for _ in range(5):
+            assert (await FeedSubscriber(path).latest())['version'] == publisher.version
+            assert (await asyncio.to_thread(read_latest, path))['matches'] == {1: [{'id': 'a'}]}
+        await asyncio.sleep(0.1)
+        open_subscribers = len(publisher._subscribers)
+        await publisher.close()
+        return open_subscribers
+
+    assert run(scenario()) == 0
+
+def test_subscribers_get_every_cycle_and_are_closed_with_the_publisher(tmp_path):
+    path = str(tmp_path / 'feed.sock')
+
+    async def scenario():
+        publisher = FeedPublisher(path)
+        await publisher.start()
+        await publisher.publish({1: []}, {'added': []})
+        received = []
+
+        async def follow():
+            async for message in FeedSubscriber(path, retry_delay=0.05).messages():
+                received.append(message['version'])
+
+        task = asyncio.create_task(follow())
+        await asyncio.sleep(0.1)
+        await publisher.publish({1: []}, {'added': []})
+        await asyncio.sleep(0.1)
+        await publisher.close()
+        task.cancel()
+        return received, publisher.version, len(publisher._subscribers)
+
+    received, version, open_subscribers = run(scenario())
+    assert received == [version - 1, version]
+    assert open_subscribers == 0
+
+def test_notify_subscribers_get_cycles_without_matches(tmp_path):
+    path = str(tmp_path / 'feed.sock')
+
+    async def scenario():
+        publisher = FeedPublisher(path)
+        await publisher.start()
+        await publisher.publish({1: [{'id': 'a'}]}, {'added': [{'id': 'a'}]}, quota_remaining=5)
+        notice = await FeedSubscriber(path, notify=True).latest()
+        full = await FeedSubscriber(path).latest()
+        await publisher.close()
+        return notice, full
+
+    notice, full = run(scenario())
+    assert notice['matches'] == {}
+    assert full['matches'] == {1: [{'id': 'a'}]}
+    assert {key: value for key, value in full.items() if key != 'matches'} == \
+        {key: value for key, value in notice.items() if key != 'matches'}
+    assert notice['quota_remaining'] == 5
@@ -0,0 +1,33 @@
+import asyncio
+from live_matches import LiveMatchClient
+
+class FakeFetcher:
+    def __init__(self, results):
+        self.results = results
+        self.calls = []
+
+    async def fetch_sport(self, sport_id):
+        self.calls.append(sport_id)
+        if self.results is None:
+            return None
+        return [{**raw, 'sport_id': sport_id} for raw in self.results]
+
+    async def close(self):
+        pass
+
+def raw(event_id, home='Arsenal', league='Premier League'):
+    return {'id': event_id, 'home': {'name': home}, 'away': {'name': 'Chelsea'},
+            'league': {'name': league}, 'ss': '1-0'}
+
+def test_fallback_is_filtered_and_stamped_without_a_producer(tmp_path, monkeypatch):
+    monkeypatch.setenv('SPORTS_FEED_SOCKET', str(tmp_path / 'missing.sock'))
+    fetcher = FakeFetcher([raw('a'), raw('b', home='Arsenal (Esports)', league='Esoccer Battle - 8 mins play')])
+    client = LiveMatchClient(fetcher=fetcher)
+    matches = asyncio.run(client.matches(1))
+    assert fetcher.calls == [1]
+    assert [match.id for match in matches] == ['a']
+    assert matches[0].sport_id == 1
+
+def test_failed_fallback_is_none(tmp_path, monkeypatch):
+    monkeypatch.setenv('SPORTS_FEED_SOCKET', str(tmp_path / 'missing.sock'))
+    assert asyncio.run(LiveMatchClient(fetcher=FakeFetcher(None)).raw_matches(1)) is None
@@ -0,0 +1,64 @@
+import pytest
+from match_index import MatchIndex
+from match_model import Match
+
+def raw(event_id, league='Premier League', home='Arsenal', away='Chelsea', minute=10, time_status='1'):
+    return {
+        'id': event_id, 'time_status': time_status, 'ss': '0-0',
+        'league': {'id': 1, 'name': league},
+        'home': {'name': home}, 'away': {'name': away},
+        'timer': {'tm': minute, 'ts': 0}
+    }
+
+def build(matches_by_sport):
+    return MatchIndex(Match.from_api(match, sport_id) for sport_id, matches in matches_by_sport.items()
+                      for match in matches)
+
+def pages(index, **filters):
+    """Every page of a query, following next_cursor"""
+    result, cursor = [], None
+    while True:
+        page, cursor = index.query(cursor=cursor, **filters)
+        result.append([(match.sport_id, match.id) for match in page])
+        if cursor is None:
+            return result
+
+@pytest.fixture
+def index():
+    return build({
+        13: [raw('c'), raw('a', minute=70)],
+        1: [raw('e', league='La Liga', home='Sevilla'), raw('b', minute=80), raw('d', time_status='3')]
+    })
+
+def test_pages_follow_sport_then_event_order(index):
+    assert pages(index, limit=2) == [[(1, 'b'), (1, 'd')], [(1, 'e'), (13, 'a')], [(13, 'c')]]
+
+def test_last_full_page_has_no_cursor(index):
+    page, cursor = index.query(limit=5)
+    assert len(page) == 5
+    assert cursor is None
+
+def test_cursor_is_the_last_key_returned(index):
+    page, cursor = index.query(limit=2)
+    assert cursor == '1:d'
+    assert [match.id for match in index.query(cursor=cursor, limit=2)[0]] == ['e', 'a']
+
+def test_filtered_pages_skip_past_the_cursor(index):
+    assert pages(index, live=True, limit=1) == [[(1, 'b')], [(1, 'e')], [(13, 'a')], [(13, 'c')]]
+    assert pages(index, min_minute=60, limit=1) == [[(1, 'b')], [(13, 'a')]]
+
+def test_cursor_past_a_removed_match_resumes_after_it(index):
+    page, _ = index.query(cursor='1:c', limit=10)
+    assert [(match.sport_id, match.id) for match in page] == [(1, 'd'), (1, 'e'), (13, 'a'), (13, 'c')]
+
+def test_filters_combine(index):
+    page, _ = index.query(sports=[1], leagues=['la liga'], team='sevil')
+    assert [match.id for match in page] == ['e']
+
+def test_malformed_cursor_is_rejected(index):
+    with pytest.raises(ValueError):
+        index.query(cursor='nope')
+
+def test_from_raw_matches_prebuilt_matches():
+    matches_by_sport = {1: [raw('b'), raw('a')]}
+    assert MatchIndex.from_raw(matches_by_sport).keys == build(matches_by_sport).keys == [(1, 'a'), (1, 'b')]
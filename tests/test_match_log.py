@@ -0,0 +1,84 @@
+import os
+from datetime import datetime
+import pytest
+from match_log import JsonlCodec, MatchLogWriter, read_cycle, read_last_cycle, read_last_header_offset
+from match_model import Match
+
+def match(event_id, sport_id, minute=10):
+    return Match.from_api({
+        'id': event_id, 'time_status': '1', 'ss': '1-0',
+        'league': {'id': 3, 'name': 'Serie A'},
+        'home': {'name': 'Milan'}, 'away': {'name': 'Inter'},
+        'timer': {'tm': minute, 'ts': 0}
+    }, sport_id, period='1st')
+
+def day(hour, minute=0):
+    return datetime(2026, 10, 18, hour, minute)
+
+@pytest.fixture(params=['jsonl', 'msgpack'])
+def writer(request, tmp_path):
+    if request.param == 'msgpack':
+        pytest.importorskip('msgpack')
+    writer = MatchLogWriter(str(tmp_path), request.param)
+    yield writer
+    writer.close()
+
+def path_of(writer):
+    return writer.path_for('2026-10-18')
+
+def test_trailer_points_at_the_last_header(writer):
+    writer.write_cycle({1: [match('a', 1)]}, day(9))
+    first_end = os.path.getsize(path_of(writer))
+    writer.write_cycle({1: [match('b', 1)]}, day(9, 1))
+    path = path_of(writer)
+    assert read_last_header_offset(path) == first_end
+    with open(path, 'rb') as f:
+        f.seek(-writer.codec.trailer_size, os.SEEK_END)
+        assert writer.codec.parse_trailer(f.read()) == first_end
+
+def test_trailer_has_a_fixed_size(writer):
+    assert len(writer.codec.trailer(0)) == len(writer.codec.trailer(2 ** 40)) == writer.codec.trailer_size
+
+def test_read_last_cycle_returns_only_the_latest(writer):
+    writer.write_cycle({1: [match('a', 1)]}, day(9))
+    writer.write_cycle({1: [match('b', 1), match('c', 1, minute=60)], 18: [match('d', 18)]}, day(9, 1))
+    header, records = read_last_cycle(path_of(writer))
+    assert (header['type'], header['cycle'], header['count']) == ('cycle', 2, 3)
+    assert header['timestamp'] == day(9, 1).isoformat()
+    assert [record['id'] for record in records] == ['b', 'c', 'd']
+    assert records[1] == {
+        'id': 'c', 'sport_id': 1, 'league_id': 3, 'league': 'Serie A', 'home': 'Milan', 'away': 'Inter',
+        'score': '1-0', 'minute': 60, 'second': 0, 'period': '1st', 'time_status': '1'
+    }
+
+def test_per_sport_reads_use_the_header_index(writer):
+    writer.write_cycle({18: [match('d', 18)], 1: [match('b', 1), match('c', 1)]}, day(9))
+    path = path_of(writer)
+    header, records = read_last_cycle(path, sport_id=18)
+    start, size, count = header['sports']['18']
+    assert (count, [record['id'] for record in records]) == (1, ['d'])
+    assert header['sports']['1'][:2] == [0, start]
+    assert start + size == header['size']
+    assert read_last_cycle(path, sport_id=99)[1] == []
+
+def test_prev_chains_cycles_across_writers(writer, tmp_path):
+    writer.write_cycle({1: [match('a', 1)]}, day(9))
+    writer.write_cycle({1: [match('b', 1)]}, day(9, 1))
+    writer.close()
+    # A restarted producer appends to the same day and keeps the chain
+    restarted = MatchLogWriter(str(tmp_path), writer.codec.suffix.lstrip('.'))
+    restarted.write_cycle({1: [match('c', 1)]}, day(9, 2))
+    restarted.close()
+
+    path = path_of(writer)
+    offset, seen = read_last_header_offset(path), []
+    while offset is not None:
+        header, records = read_cycle(path, offset)
+        seen.append(records[0]['id'])
+        offset = header['prev']
+    assert seen == ['c', 'b', 'a']
+
+def test_empty_log_has_no_cycle(tmp_path):
+    path = tmp_path / f"matches-2026-10-18{JsonlCodec.suffix}"
+    path.touch()
+    assert read_last_cycle(str(path)) is None
@@ -0,0 +1,29 @@
+import os
+from match_diff import SnapshotDiffer
+from match_model import Match
+from match_store import MatchHistory, MatchStore
+
+def match(event_id, home, away, score='0-0'):
+    return Match.from_api({
+        'id': event_id, 'ss': score, 'league': {'id': 2, 'name': 'Ligue 1'},
+        'home': {'name': home}, 'away': {'name': away}, 'timer': {'tm': 10}
+    }, 1)
+
+def test_history_reads_what_the_store_wrote(tmp_path):
+    path = str(tmp_path / 'history.db')
+    store = MatchStore(path)
+    differ = SnapshotDiffer()
+    store.record(differ.diff({1: [match('a', 'Lyon', 'Nice')]}), recorded_at=1.0)
+    store.record(differ.diff({1: [match('a', 'Lyon', 'Nice', '1-0')]}), recorded_at=2.0)
+    store.close()
+
+    history = MatchHistory(path)
+    assert [(row['change'], row['score']) for row in history.query(event_id='a')] == \
+        [('added', '0-0'), ('score_changed', '1-0')]
+    assert len(history.head_to_head('Nice', 'Lyon')) == 2
+    assert history.query(team='Lyon', since=2.0)[0]['recorded_at'] == 2.0
+
+def test_history_never_creates_the_database(tmp_path):
+    path = str(tmp_path / 'history.db')
+    assert MatchHistory(path).query(team='Lyon') == []
+    assert not os.path.exists(path)
@@ -0,0 +1,46 @@
+from match_model import Match
+from poll_cadence import AdaptivePollScheduler
+
+def scheduler():
+    return AdaptivePollScheduler([1, 18], base_interval=60.0, min_interval=15.0, max_interval=600.0)
+
+def soccer(minute, event_id='a'):
+    return Match.from_api({'id': event_id, 'timer': {'tm': minute}}, 1)
+
+def test_long_empty_streak_stays_at_max_interval():
+    cadence = scheduler()
+    for cycle in range(5000):
+        cadence.record(1, [], now=float(cycle))
+    state = cadence.sports[1]
+    assert state.empty_streak == 5000
+    assert state.interval == 600.0
+    assert state.next_due == 4999.0 + 600.0
+
+def test_empty_polls_back_off_exponentially():
+    cadence = scheduler()
+    intervals = []
+    for _ in range(4):
+        cadence.record(1, [], now=0.0)
+        intervals.append(cadence.sports[1].interval)
+    assert intervals == [120.0, 240.0, 480.0, 600.0]
+
+def test_live_matches_reset_the_backoff():
+    cadence = scheduler()
+    cadence.record(1, [], now=0.0)
+    cadence.record(1, [soccer(10, str(i)) for i in range(20)], now=0.0)
+    state = cadence.sports[1]
+    assert (state.empty_streak, state.interval) == (0, 30.0)
+
+def test_closing_matches_poll_at_min_interval():
+    cadence = scheduler()
+    cadence.record(1, [soccer(85)], now=100.0)
+    assert cadence.sports[1].interval == 15.0
+    assert cadence.due_sports(now=114.0) == [18]
+    assert cadence.due_sports(now=115.0) == [1, 18]
+
+def test_failure_keeps_the_interval():
+    cadence = scheduler()
+    cadence.record(1, [], now=0.0)
+    cadence.record_failure(1, now=10.0)
+    state = cadence.sports[1]
+    assert (state.interval, state.next_due, state.reason) == (120.0, 130.0, 'fetch failed')
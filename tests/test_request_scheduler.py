@@ -0,0 +1,77 @@
+import asyncio
+from bisect import bisect_left
+import pytest
+import request_scheduler
+from request_scheduler import (
+    PRIORITY_LIVE, PRIORITY_UPCOMING, RequestScheduler, SharedQuota
+)
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(request_scheduler.time, 'time', clock)
+    return clock
+
+def take_every_second(scheduler, clock, seconds, priority=PRIORITY_LIVE):
+    """Try one call per second, returning the times that were granted"""
+    granted = []
+    for _ in range(seconds):
+        if scheduler._try_take(priority) <= 0:
+            granted.append(clock.now)
+        clock.now += 1
+    return granted
+
+def most_in_any_hour(times):
+    return max(bisect_left(times, at + 3600) - i for i, at in enumerate(times))
+
+def test_no_hour_sees_more_than_the_budget(clock):
+    scheduler = RequestScheduler(hourly_budget=1000, minute_budget=60)
+    granted = take_every_second(scheduler, clock, 3 * 3600)
+    assert most_in_any_hour(granted) == 1000
+    assert len(take_every_second(RequestScheduler(1000, 60), clock, 3600)) == 1000
+
+def test_minute_budget_caps_bursts(clock):
+    scheduler = RequestScheduler(hourly_budget=1000, minute_budget=5)
+    assert [scheduler._try_take(PRIORITY_LIVE) <= 0 for _ in range(6)] == [True] * 5 + [False]
+    assert scheduler.wait_time() == pytest.approx(60.0)
+
+def test_lower_priorities_leave_a_reserve(clock):
+    scheduler = RequestScheduler(hourly_budget=10, minute_budget=100)
+    granted = [scheduler._try_take(PRIORITY_UPCOMING) <= 0 for _ in range(10)]
+    assert granted.count(True) == 8
+    assert scheduler._try_take(PRIORITY_LIVE) <= 0
+    assert scheduler.remaining() == 1
+
+def test_upstream_report_caps_the_budget(clock):
+    scheduler = RequestScheduler(hourly_budget=1000, minute_budget=100)
+    asyncio.run(scheduler.observe_response(200, {'X-RateLimit-Remaining': '2'}))
+    assert scheduler.remaining() == 2
+    assert len(take_every_second(scheduler, clock, 10)) == 2
+    assert scheduler.remaining() == 0
+
+def test_rate_limit_pauses_calls(clock):
+    scheduler = RequestScheduler(hourly_budget=1000, minute_budget=100)
+    asyncio.run(scheduler.observe_response(429, {'Retry-After': '30'}))
+    assert scheduler.wait_time() == pytest.approx(30.0)
+
+def test_shared_quota_is_one_budget_across_schedulers(clock, tmp_path):
+    path = str(tmp_path / 'quota.db')
+    first = RequestScheduler(hourly_budget=10, minute_budget=100, shared=SharedQuota(path))
+    second = RequestScheduler(hourly_budget=10, minute_budget=100, shared=SharedQuota(path))
+    granted = [scheduler._try_take(PRIORITY_LIVE) <= 0 for _ in range(6) for scheduler in (first, second)]
+    assert granted.count(True) == 10
+    assert second.remaining() == 0
+
+    asyncio.run(first.observe_response(429, {'Retry-After': '60'}))
+    clock.now += 3600
+    assert second.wait_time() == 0
+    assert second._try_take(PRIORITY_LIVE) <= 0
+    assert first.wait_time() == 0
+    assert first.remaining() == 9
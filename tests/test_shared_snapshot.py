@@ -0,0 +1,84 @@
+import json
+from datetime import datetime
+import pytest
+from shared_snapshot import HEADER, MAGIC, SharedSnapshotReader, SharedSnapshotWriter
+from snapshot import Snapshot
+
+def raw(event_id, home):
+    return {
+        'id': event_id, 'time_status': '1', 'ss': '1-0',
+        'league': {'id': 7, 'name': 'Premier League'},
+        'home': {'name': home}, 'away': {'name': 'Visitors'},
+        'timer': {'tm': 30, 'ts': 0}
+    }
+
+@pytest.fixture
+def snapshot():
+    # Enough teams for the full payload to cross the compression threshold
+    matches = {1: [raw(str(i), f"Home Team {i}") for i in range(40)], 18: [raw('x', 'Court')]}
+    return Snapshot(matches, datetime(2026, 10, 18, 9, 30), 7, {'quota_remaining': 42})
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'snapshot.bin')
+
+def test_file_starts_with_magic_and_directory(snapshot, path):
+    SharedSnapshotWriter(path).write(snapshot)
+    with open(path, 'rb') as f:
+        data = f.read()
+    magic, length = HEADER.unpack_from(data, 0)
+    assert magic == MAGIC
+    directory = json.loads(data[HEADER.size:HEADER.size + length])
+    assert directory['version'] == 7
+    assert directory['meta'] == {'quota_remaining': 42}
+    assert set(directory['sports']) == {'1', '18'}
+
+    # Blob offsets are relative to the end of the directory, laid out back to back
+    blobs = data[HEADER.size + length:]
+    start, size, etag = directory['payload']['body']
+    assert (start, etag) == (0, snapshot.payload.etag)
+    assert blobs[start:start + size] == snapshot.payload.body
+    entries = [directory['payload']['body'], *directory['payload']['variants'].values()]
+    for entry in directory['sports'].values():
+        entries += [entry['body'], *entry['variants'].values()]
+    entries.append(directory['empty']['body'])
+    assert sum(size for _, size, _ in entries) == len(blobs)
+
+def test_reader_serves_the_writers_bytes(snapshot, path):
+    writer = SharedSnapshotWriter(path)
+    writer.write(snapshot)
+    assert writer.version == 7
+
+    mapped = SharedSnapshotReader(path).load()
+    assert (mapped.version, mapped.last_update, mapped.meta) == (7, snapshot.last_update, snapshot.meta)
+    assert mapped.last_modified == snapshot.last_modified
+    assert (bytes(mapped.payload.body), mapped.payload.etag) == (snapshot.payload.body, snapshot.payload.etag)
+    assert snapshot.payload.variants
+    for encoding, (body, etag) in snapshot.payload.variants.items():
+        mapped_body, mapped_etag = mapped.payload.variants[encoding]
+        assert (bytes(mapped_body), mapped_etag) == (body, etag)
+    assert bytes(mapped.sport_payload(18).body) == snapshot.sport_payload(18).body
+    assert bytes(mapped.sport_payload(99).body) == snapshot.empty_sport_payload.body
+
+def test_reader_indexes_the_mapped_matches(snapshot, path):
+    SharedSnapshotWriter(path).write(snapshot)
+    mapped = SharedSnapshotReader(path).load_indexed()
+    assert mapped.index.keys == snapshot.index.keys
+    assert mapped.matches[18] == snapshot.matches[18]
+
+def test_reader_remaps_only_a_replaced_file(snapshot, path):
+    writer = SharedSnapshotWriter(path)
+    writer.write(snapshot)
+    reader = SharedSnapshotReader(path)
+    first = reader.load()
+    assert reader.load() is first
+    writer.write(Snapshot({}, datetime(2026, 10, 18, 9, 31), 8))
+    assert reader.load().version == 8
+
+def test_missing_file_has_no_snapshot(tmp_path):
+    assert SharedSnapshotReader(str(tmp_path / 'missing.bin')).load() is None
+
+def test_other_files_are_rejected(path):
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(b'NOTSNAP!', 2) + b'{}')
+    assert SharedSnapshotReader(path).load() is None
@@ -0,0 +1,22 @@
+import pytest
+from match_index import MatchIndex
+from snapshot_source import SnapshotSource, group_matches
+
+def raw(event_id, minute, league='Premier League'):
+    return {'id': event_id, 'league': {'id': 1, 'name': league}, 'timer': {'tm': minute}}
+
+def test_groups_keep_the_latest_minute_first_within_a_league():
+    index = MatchIndex.from_raw({
+        13: [raw('t', 2, 'ATP')],
+        1: [raw('a', 10), raw('b', 80), raw('c', 45), raw('d', 5, 'La Liga')]
+    })
+    groups = [(sport['id'], [(league, [match.id for match in matches]) for league, matches in leagues])
+              for sport, leagues in group_matches(index)]
+    assert groups == [
+        (1, [('La Liga', ['d']), ('Premier League', ['b', 'c', 'a'])]),
+        (13, [('ATP', ['t'])])
+    ]
+
+def test_sources_must_implement_load():
+    with pytest.raises(TypeError):
+        SnapshotSource()